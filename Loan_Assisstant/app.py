@@ -11,34 +11,7 @@ login
 → gold_step5 (Summary & Submit)
 → gold_step6 (Confirmation)
 """
-from core.doc_verification import (
-    ocr_tool,
-    ner_entity_extraction,
-    identity_consistency_check
-)
-
-from flows.customer_flow import render_customer_flow
-from flows.officer_flow import render_officer_flow
-
 import streamlit as st
-import csv
-import os
-import uuid
-import re
-from datetime import date
-
-from core.masking import mask_dob, mask_pan, mask_mobile
-from core.emi_agent import emi_calculation_agent
-
-
-from core.validation import (
-    valid_name,
-    valid_mobile,
-    valid_email,
-    valid_pan,
-    valid_aadhaar,
-    valid_pin
-)
 
 # =============================
 # SESSION STATE
@@ -74,28 +47,27 @@ if "verification_result" not in st.session_state:
 # =============================
 # FILE PATHS
 # =============================
-CUSTOMER_FILE = "data/customers.csv"
-OFFICER_FILE = "data/loan_officers.csv"
+from core.repository import (
+    OFFICER_FILE,
+    OFFICER_HEADER,
+    MASTER_TABLES,
+    append_row,
+    ensure_table,
+    recover_batches
+)
 
 
 # =============================
 # INITIALIZE FILES
 # =============================
 def init_files():
-    if not os.path.exists(CUSTOMER_FILE):
-        with open(CUSTOMER_FILE, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                "Customer_ID", "Full_Name", "DOB", "Gender",
-                "Mobile", "Email", "Address",
-                "PAN", "Aadhaar", "PIN"
-            ])
-
-    if not os.path.exists(OFFICER_FILE):
-        with open(OFFICER_FILE, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["Officer_ID", "Name", "EmpCode", "PIN"])
-            writer.writerow(["OFF001", "Anita Sharma", "EMP1023", "9999"])
+    recover_batches()
+
+    if ensure_table(OFFICER_FILE, OFFICER_HEADER):
+        append_row(OFFICER_FILE, ["OFF001", "Anita Sharma", "EMP1023", "9999"])
+
+    for path, header in MASTER_TABLES.items():
+        ensure_table(path, header)
 
 init_files()
 
@@ -109,9 +81,13 @@ st.caption("Academic Demo | Policy-Driven UI | No Auto-Approval")
 role = st.sidebar.selectbox("Select Role", ["Customer", "Loan Officer"])
 st.divider()
 
+# Flows are imported per role so officer-only sessions never load the
+# customer-side dependencies (and vice versa).
 if role == "Customer":
+    from flows.customer_flow import render_customer_flow
     render_customer_flow()
 elif role == "Loan Officer":
+    from flows.officer_flow import render_officer_flow
     render_officer_flow()
 
 
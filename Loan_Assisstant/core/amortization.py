@@ -0,0 +1,123 @@
+"""
+Amortization schedule engine.
+
+Follows the gold loan terms shown to customers ("Interest & Fees"):
+- interest accrues on actual days outstanding
+- year reckoned as DAY_COUNT_BASIS (365) days
+- minimum interest of MIN_INTEREST_DAYS (7) days
+
+The EMI itself comes from core.emi_agent (reducing balance); each
+installment pays the interest accrued since the previous due date and
+the rest goes to principal. The final installment clears the balance.
+
+iter_schedule() is a generator, so long tenures can be streamed.
+schedule() is the cached, materialized version for pages and bulk use.
+"""
+
+import calendar
+from datetime import date
+from functools import lru_cache
+
+from core.config import DAY_COUNT_BASIS, MIN_INTEREST_DAYS
+from core.emi_agent import emi_calculation_agent
+
+
+def add_months(start, months):
+    """
+    Same day-of-month `months` later, clamped to the month's last day.
+    """
+    month_index = start.month - 1 + months
+    year = start.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(start.day, calendar.monthrange(year, month)[1])
+    return date(year, month, day)
+
+
+def iter_schedule(loan_amount, annual_rate, tenure_months, start_date):
+    """
+    Yields one dict per installment:
+    Installment, Due_Date, Days, Opening_Balance, Interest, Principal,
+    EMI, Closing_Balance (amounts rounded to paise).
+    """
+    emi, _ = emi_calculation_agent(loan_amount, annual_rate, tenure_months)
+    daily_rate = annual_rate / 100 / DAY_COUNT_BASIS
+
+    balance = float(loan_amount)
+    previous = start_date
+
+    for k in range(1, tenure_months + 1):
+        due = add_months(start_date, k)
+        days = (due - previous).days
+        charged_days = max(days, MIN_INTEREST_DAYS) if k == 1 else days
+
+        interest = round(balance * daily_rate * charged_days, 2)
+        if k == tenure_months:
+            principal = round(balance, 2)
+        else:
+            principal = round(min(max(emi - interest, 0.0), balance), 2)
+        closing = round(balance - principal, 2)
+
+        yield {
+            "Installment": k,
+            "Due_Date": due.isoformat(),
+            "Days": days,
+            "Opening_Balance": round(balance, 2),
+            "Interest": interest,
+            "Principal": principal,
+            "EMI": round(interest + principal, 2),
+            "Closing_Balance": closing
+        }
+
+        balance = closing
+        previous = due
+
+
+@lru_cache(maxsize=1024)
+def _cached_schedule(loan_amount, annual_rate, tenure_months, start_date):
+    return tuple(
+        iter_schedule(loan_amount, annual_rate, tenure_months, start_date)
+    )
+
+
+def schedule(loan_amount, annual_rate, tenure_months, start_date):
+    """
+    Full schedule as a list, cached per (amount, rate, tenure, start).
+    """
+    return [
+        dict(row) for row in
+        _cached_schedule(loan_amount, annual_rate, tenure_months, start_date)
+    ]
+
+
+def schedule_summary(rows):
+    return {
+        "Total_Interest": round(sum(r["Interest"] for r in rows), 2),
+        "Total_Payable": round(sum(r["EMI"] for r in rows), 2),
+        "Installments": len(rows)
+    }
+
+
+def application_start_date(app):
+    """
+    Date the application was created, or today if it cannot be read.
+    """
+    try:
+        return date.fromisoformat(app.get("Created_At", "")[:10])
+    except ValueError:
+        return date.today()
+
+
+def schedules_for(applications, annual_rate):
+    """
+    Bulk helper for the officer flow: {Application_ID: schedule rows}.
+    Identical loan terms share one cached computation.
+    """
+    return {
+        app["Application_ID"]: schedule(
+            int(float(app["Requested_Amount"])),
+            annual_rate,
+            int(app["Tenure"]),
+            application_start_date(app)
+        )
+        for app in applications
+    }
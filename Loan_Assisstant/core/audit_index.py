@@ -0,0 +1,374 @@
+"""
+Sidecar index over the audit log (core.audit_log).
+
+Entries are numbered in log order. Two append-only files in
+AUDIT_SEGMENT_DIR/index/ are written next to every flush and rotation:
+
+postings.csv : Entry, Offset, Timestamp, Officer, Application_ID
+               (one per entry; Offset = byte offset in the file the
+               entry was written to, kept when that file is rotated)
+blocks.csv   : First_Entry, Segment, Offset, Base, End -- where runs of
+               entries are: a gzip member at Offset of Segment holding
+               the bytes from Base of the rotated file, or (Segment "")
+               the active file, indexed up to byte End
+
+Both are replayed into memory on first use and tailed afterwards (so
+writes from other processes are picked up):
+
+- postings : entry numbers per Application_ID and per Officer
+- time     : min / max Timestamp per TIME_STRIDE entries (sparse)
+- blocks   : entry number -> gzip member, or the active file
+
+A query picks entry numbers from postings and time strides, then reads
+one record per entry: seek in the active file, or in a decompressed
+gzip member (about AUDIT_BLOCK_BYTES, cached), never the whole log. If
+the index and the log disagree (e.g. after a crash) the missing tail
+is indexed, or the index is rebuilt from the log.
+"""
+
+import csv
+import io
+import os
+import zlib
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+
+from core import csv_index
+from core.config import AUDIT_SEGMENT_DIR
+from core.repository import AUDIT_FILE, AUDIT_HEADER
+
+INDEX_DIR = os.path.join(AUDIT_SEGMENT_DIR, "index")
+POSTINGS_FILE = os.path.join(INDEX_DIR, "postings.csv")
+POSTINGS_HEADER = ["Entry", "Offset", "Timestamp", "Officer", "Application_ID"]
+BLOCKS_FILE = os.path.join(INDEX_DIR, "blocks.csv")
+BLOCKS_HEADER = ["First_Entry", "Segment", "Offset", "Base", "End"]
+
+TIME_STRIDE = 256        # entries per time-index bucket
+
+
+def _empty_state():
+    return {
+        "postings_pos": 0,
+        "blocks_pos": 0,
+        "entries": 0,
+        "offsets": array("q"),
+        "apps": {},
+        "officers": {},
+        "time": [],             # [first entry, min ts, max ts] per stride
+        "segment_blocks": [],   # (first entry, segment name, member offset, base)
+        "active_first": None,   # first entry in the active file
+        "active_end": 0
+    }
+
+
+_STATE = _empty_state()
+
+
+def reset():
+    """
+    Forgets the in-memory index; replayed from disk on next use.
+    """
+    _STATE.update(_empty_state())
+
+
+# =============================
+# REPLAY
+# =============================
+def _tail(path, pos):
+    """
+    Returns (new pos, rows) for the complete lines of `path` past byte
+    `pos` (index rows never span lines).
+    """
+    if not os.path.exists(path):
+        return pos, []
+    with open(path, "rb") as f:
+        f.seek(pos)
+        data = f.read()
+    data = data[:data.rfind(b"\n") + 1]
+    rows = list(csv.reader(io.StringIO(data.decode("utf-8"), newline="")))
+    if pos == 0 and rows:
+        rows = rows[1:]   # header
+    return pos + len(data), rows
+
+
+def refresh():
+    """
+    Replays rows appended to the index files since the last call.
+    """
+    pos, rows = _tail(POSTINGS_FILE, _STATE["postings_pos"])
+    apps, officers, stride = _STATE["apps"], _STATE["officers"], _STATE["time"]
+    offsets = _STATE["offsets"]
+    for entry, offset, timestamp, officer, application_id in rows:
+        entry = int(entry)
+        offsets.append(int(offset))
+        apps.setdefault(application_id, []).append(entry)
+        officers.setdefault(officer, []).append(entry)
+        if entry % TIME_STRIDE == 0:
+            stride.append([entry, timestamp, timestamp])
+        elif timestamp < stride[-1][1]:
+            stride[-1][1] = timestamp
+        elif timestamp > stride[-1][2]:
+            stride[-1][2] = timestamp
+    if rows:
+        _STATE["entries"] = int(rows[-1][0]) + 1
+    _STATE["postings_pos"] = pos
+
+    pos, rows = _tail(BLOCKS_FILE, _STATE["blocks_pos"])
+    for first, segment, offset, base, end in rows:
+        if segment:
+            # a segment row means the active file was rotated into it
+            _STATE["segment_blocks"].append((int(first), segment, int(offset), int(base)))
+            _STATE["active_first"] = None
+            _STATE["active_end"] = 0
+        else:
+            if _STATE["active_first"] is None:
+                _STATE["active_first"] = int(first)
+            _STATE["active_end"] = int(end)
+    _STATE["blocks_pos"] = pos
+
+
+def _append(path, header, rows):
+    os.makedirs(INDEX_DIR, exist_ok=True)
+    fresh = not os.path.exists(path)
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        if fresh:
+            writer.writerow(header)
+        writer.writerows(rows)
+
+
+# =============================
+# MAINTENANCE (called by core.audit_log under its write lock)
+# =============================
+def on_written(entries, spans):
+    """
+    `entries` (AUDIT_HEADER lists) were appended to the active file at
+    byte `spans` [(offset, end)].
+    """
+    if not entries:
+        return
+    first = _STATE["entries"]
+    _append(POSTINGS_FILE, POSTINGS_HEADER, [
+        [first + i, offset, e[0], e[1], e[2]]
+        for i, (e, (offset, _)) in enumerate(zip(entries, spans))
+    ])
+    _append(BLOCKS_FILE, BLOCKS_HEADER, [[first, "", spans[0][0], spans[0][0], spans[-1][1]]])
+    refresh()
+
+
+def on_rotated(segment, members, segment_paths):
+    """
+    The active file was compressed into `segment`; `members` is
+    [(member offset, base, entries in member)].
+    """
+    first = _STATE["active_first"]
+    if first is None:
+        first = _STATE["entries"]
+    if first + sum(n for _, _, n in members) != _STATE["entries"]:
+        rebuild(segment_paths)
+        return
+
+    name = os.path.basename(segment)
+    rows, entry = [], first
+    for offset, base, count in members:
+        rows.append([entry, name, offset, base, 0])
+        entry += count
+    _append(BLOCKS_FILE, BLOCKS_HEADER, rows)
+    refresh()
+
+
+def catch_up(segment_paths):
+    """
+    Brings the index level with the log: indexes entries in the active
+    file past what is indexed (a crash between write and index), or
+    rebuilds when the log holds less than the index claims.
+    """
+    refresh()
+    segment_paths = _compressed(segment_paths)
+    size = os.path.getsize(AUDIT_FILE) if os.path.exists(AUDIT_FILE) else 0
+    indexed = {os.path.basename(p) for p in segment_paths}
+    known = {b[1] for b in _STATE["segment_blocks"]}
+
+    if size < _STATE["active_end"] or indexed != known:
+        rebuild(segment_paths)
+    elif size > _STATE["active_end"]:
+        entries, spans = [], []
+        with open(AUDIT_FILE, "rb") as f:
+            for offset, end, row in csv_index.iter_records(f, _STATE["active_end"]):
+                if row != AUDIT_HEADER:
+                    entries.append(row)
+                    spans.append((offset, end))
+        on_written(entries, spans)
+
+
+def _compressed(segment_paths):
+    # a segment still waiting for compression is indexed once it is done
+    return [p for p in segment_paths if p.endswith(".gz")]
+
+
+def _members(path):
+    """
+    Yields (member offset, raw CSV bytes) for each gzip member.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    pos = 0
+    while pos < len(data):
+        d = zlib.decompressobj(wbits=31)
+        raw = d.decompress(data[pos:])
+        yield pos, raw
+        pos = len(data) - len(d.unused_data)
+
+
+def rebuild(segment_paths):
+    """
+    Re-indexes the whole log: `segment_paths` (oldest first) and the
+    active file.
+    """
+    postings, blocks = [], []
+    _member.cache_clear()
+
+    for path in _compressed(segment_paths):
+        base = 0
+        for offset, raw in _members(path):
+            blocks.append([len(postings), os.path.basename(path), offset, base, 0])
+            for rel, _, row in csv_index.iter_records(io.BytesIO(raw), 0):
+                if row != AUDIT_HEADER:
+                    postings.append([len(postings), base + rel] + row[:3])
+            base += len(raw)
+
+    if os.path.exists(AUDIT_FILE):
+        with open(AUDIT_FILE, "rb") as f:
+            for offset, end, row in csv_index.iter_records(f, 0):
+                if row == AUDIT_HEADER:
+                    continue
+                if not blocks or blocks[-1][1]:
+                    blocks.append([len(postings), "", offset, offset, end])
+                blocks[-1][4] = end
+                postings.append([len(postings), offset] + row[:3])
+
+    os.makedirs(INDEX_DIR, exist_ok=True)
+    for path, header, rows in (
+        (POSTINGS_FILE, POSTINGS_HEADER, postings),
+        (BLOCKS_FILE, BLOCKS_HEADER, blocks)
+    ):
+        with open(path + ".tmp", "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+        os.replace(path + ".tmp", path)
+
+    reset()
+    refresh()
+
+
+# =============================
+# READING ENTRIES
+# =============================
+@lru_cache(maxsize=64)
+def _member(segment, offset):
+    """
+    Raw bytes of one gzip member (segments never change once written).
+    """
+    with open(os.path.join(AUDIT_SEGMENT_DIR, segment), "rb") as f:
+        f.seek(offset)
+        d = zlib.decompressobj(wbits=31)
+        out = []
+        while not d.eof:
+            chunk = f.read(64 * 1024)
+            if not chunk:
+                break
+            out.append(d.decompress(chunk))
+    return b"".join(out)
+
+
+def _record(f, offset):
+    for _, _, row in csv_index.iter_records(f, offset):
+        return row
+
+
+def _fetch(entries):
+    """
+    Yields (entry, row) for entry numbers; each gzip member is
+    decompressed once however many of its entries are asked for.
+    """
+    offsets = _STATE["offsets"]
+    blocks = _STATE["segment_blocks"]
+    firsts = [b[0] for b in blocks]
+    active_first = _STATE["active_first"]
+    active = None
+    key, buf, base = None, None, 0
+
+    try:
+        for entry in entries:
+            if active_first is not None and entry >= active_first:
+                if active is None:
+                    active = open(AUDIT_FILE, "rb")
+                yield entry, _record(active, offsets[entry])
+                continue
+            _, segment, offset, base = blocks[bisect_right(firsts, entry) - 1]
+            if (segment, offset) != key:
+                key = (segment, offset)
+                buf = io.BytesIO(_member(segment, offset))
+            yield entry, _record(buf, offsets[entry] - base)
+    finally:
+        if active:
+            active.close()
+
+
+# =============================
+# QUERIES
+# =============================
+def _bucket_overlaps(entry, start, end):
+    _, lo, hi = _STATE["time"][entry // TIME_STRIDE]
+    return (end is None or lo < end) and (start is None or hi >= start)
+
+
+def _in_range(start, end):
+    """
+    Entry numbers whose time bucket overlaps [start, end).
+    """
+    total = _STATE["entries"]
+    for first, lo, hi in _STATE["time"]:
+        if (end is None or lo < end) and (start is None or hi >= start):
+            yield from range(first, min(first + TIME_STRIDE, total))
+
+
+def query(application_id=None, officer=None, start=None, end=None, limit=None):
+    """
+    Audit entries (dicts, AUDIT_HEADER keys, oldest first) matching
+    every given filter: application id, officer, and Timestamp in
+    [start, end) as ISO strings. With `limit`, only the latest ones.
+    """
+    if application_id is not None or officer is not None:
+        lists = []
+        if application_id is not None:
+            lists.append(_STATE["apps"].get(application_id, []))
+        if officer is not None:
+            lists.append(_STATE["officers"].get(officer, []))
+        lists.sort(key=len)
+        others = [set(l) for l in lists[1:]]
+        candidates = [
+            e for e in lists[0]
+            if all(e in s for s in others) and _bucket_overlaps(e, start, end)
+        ]
+    else:
+        candidates = list(_in_range(start, end))
+
+    result = []
+    for _, row in _fetch(reversed(candidates)):
+        if (start is None or row[0] >= start) and (end is None or row[0] < end):
+            result.append(dict(zip(AUDIT_HEADER, row)))
+            if limit and len(result) >= limit:
+                break
+    result.reverse()
+    return result
+
+
+def officers():
+    return sorted(o for o in _STATE["officers"] if o)
+
+
+def entry_count():
+    return _STATE["entries"]
@@ -0,0 +1,374 @@
+"""
+Buffered, rotating audit log.
+
+log() only queues the entry in memory; a background thread writes the
+queue to the active file (data/audit_logs.csv, no header row, columns
+AUDIT_HEADER) at least every AUDIT_FLUSH_SECONDS, or as soon as
+AUDIT_BUFFER_MAX_ENTRIES are waiting, fsync'ing each flush when
+AUDIT_FSYNC is set. Entries are written in log() order; a crash loses
+at most the last flush interval. log() returns a Future resolved once
+its entry is written; log(..., wait=True) flushes and returns only
+then (officer decisions use it). A failed flush puts its unwritten
+entries back at the head of the queue (their Future stays pending)
+and the flusher retries after AUDIT_FLUSH_SECONDS.
+
+Rotation : when the active file passes AUDIT_SEGMENT_MAX_BYTES, or
+           the next entry is from a later day than the file's first,
+           it is renamed into AUDIT_SEGMENT_DIR and gzip-compressed to
+           audit_logs.<seq>.<day>.csv.gz. Segments are concatenated
+           gzip members of about AUDIT_BLOCK_BYTES each (still one
+           valid .gz file), so a block can be read without
+           decompressing the whole segment.
+Reading  : iter_entries() yields every entry, oldest first, across the
+           compressed segments and the active file.
+Crashes  : a segment renamed but not yet compressed is finished on the
+           next flush; until then it is read uncompressed.
+Index    : core.audit_index is updated on every write and rotation;
+           query() answers by application, officer and time range.
+
+The audit log is its own store whichever STORAGE_BACKEND is active.
+"""
+
+import atexit
+import csv
+import glob
+import gzip
+import io
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import datetime
+
+from core import audit_index, csv_index
+from core.config import (
+    AUDIT_BLOCK_BYTES,
+    AUDIT_BUFFER_MAX_ENTRIES,
+    AUDIT_FLUSH_SECONDS,
+    AUDIT_FSYNC,
+    AUDIT_ROTATE_DAILY,
+    AUDIT_SEGMENT_DIR,
+    AUDIT_SEGMENT_MAX_BYTES
+)
+from core.repository import AUDIT_FILE, AUDIT_HEADER
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; the thread lock still applies
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_RE = re.compile(r"audit_logs\.(\d{6})\.([\d-]+)\.csv(\.gz)?$")
+
+_BUFFER = []
+_COND = threading.Condition()
+_WRITE_LOCK = threading.Lock()
+_FLUSHER = {"thread": None, "written": Future()}
+_ACTIVE = {"ino": None, "day": None}
+
+
+# =============================
+# LOGGING
+# =============================
+def log(officer, application_id, action, details, timestamp=None, wait=False):
+    """
+    Queues one audit entry; written by the flusher thread. Returns a
+    Future resolved once the entry is written (and fsync'd under
+    AUDIT_FSYNC), shared by every entry of the same flush. wait=True
+    flushes now and waits for it.
+    """
+    entry = [
+        timestamp or datetime.now().isoformat(),
+        officer,
+        application_id,
+        action,
+        details
+    ]
+    _ensure_flusher()
+    with _COND:
+        _BUFFER.append(entry)
+        written = _FLUSHER["written"]
+        if len(_BUFFER) >= AUDIT_BUFFER_MAX_ENTRIES:
+            _COND.notify()
+
+    if wait:
+        if not written.done():
+            flush()
+        written.result()
+    return written
+
+
+def _ensure_flusher():
+    with _COND:
+        if _FLUSHER["thread"] is None:
+            _FLUSHER["thread"] = threading.Thread(
+                target=_run, name="audit-flush", daemon=True
+            )
+            _FLUSHER["thread"].start()
+
+
+def _run():
+    while True:
+        with _COND:
+            if len(_BUFFER) < AUDIT_BUFFER_MAX_ENTRIES:
+                _COND.wait(AUDIT_FLUSH_SECONDS)
+        try:
+            flush()
+        except Exception:
+            logger.exception("audit flush failed; retrying in %ss", AUDIT_FLUSH_SECONDS)
+            time.sleep(AUDIT_FLUSH_SECONDS)
+
+
+# =============================
+# FLUSH / ROTATION
+# =============================
+def _day(entry):
+    return entry[0][:10]
+
+
+def _active_day():
+    """
+    Day of the first entry in the active file (None if empty).
+    """
+    if not os.path.exists(AUDIT_FILE):
+        return None
+    ino = os.stat(AUDIT_FILE).st_ino
+    if _ACTIVE["ino"] != ino or _ACTIVE["day"] is None:
+        _ACTIVE.update(ino=ino, day=None)
+        with open(AUDIT_FILE, "rb") as f:
+            for _, _, row in csv_index.iter_records(f, 0):
+                if row and row != AUDIT_HEADER:
+                    _ACTIVE["day"] = row[0][:10]
+                    break
+    return _ACTIVE["day"]
+
+
+def _rotation_due(next_day):
+    if not os.path.exists(AUDIT_FILE):
+        return False
+    if os.path.getsize(AUDIT_FILE) >= AUDIT_SEGMENT_MAX_BYTES:
+        return True
+    day = _active_day()
+    return AUDIT_ROTATE_DAILY and day is not None and next_day > day
+
+
+def _write(entries):
+    """
+    Appends entries to the active file and indexes them.
+    """
+    spans = []
+    with open(AUDIT_FILE, "a", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        for entry in entries:
+            offset = f.tell()
+            writer.writerow(entry)
+            spans.append((offset, f.tell()))
+        f.flush()
+        if AUDIT_FSYNC:
+            os.fsync(f.fileno())
+    if _ACTIVE["day"] is None:
+        _ACTIVE["day"] = _day(entries[0])
+    audit_index.on_written(entries, spans)
+
+
+def flush():
+    """
+    Writes every queued entry to the active file, rotating first when
+    due, and brings the index level with the log. Returns the number
+    of entries written. On failure the entries not yet written go
+    back to the head of the queue and the error is re-raised.
+    """
+    with _WRITE_LOCK:
+        with _COND:
+            entries = list(_BUFFER)
+            del _BUFFER[:]
+            written = _FLUSHER["written"]
+            _FLUSHER["written"] = Future()
+
+        start = 0
+        try:
+            with _segment_lock():
+                _finish_rotations()
+                audit_index.catch_up(segments())
+                for i in range(1, len(entries) + 1):
+                    if i < len(entries) and _day(entries[i]) == _day(entries[start]):
+                        continue
+                    if _rotation_due(_day(entries[start])):
+                        _rotate()
+                    _write(entries[start:i])
+                    start = i
+        except BaseException:
+            _requeue(entries[start:], written)
+            raise
+        written.set_result(None)
+        return len(entries)
+
+
+def _requeue(entries, written):
+    """
+    Puts unwritten entries back ahead of any logged since, under their
+    original Future; entries logged meanwhile resolve with them.
+    """
+    with _COND:
+        _BUFFER[:0] = entries
+        since = _FLUSHER["written"]
+        _FLUSHER["written"] = written
+    written.add_done_callback(lambda _: since.set_result(None))
+
+
+def rotate():
+    """
+    Flushes, then moves the active file into a compressed segment.
+    """
+    flush()
+    with _WRITE_LOCK, _segment_lock():
+        _finish_rotations()
+        if os.path.exists(AUDIT_FILE) and _active_day():
+            _rotate()
+
+
+@contextmanager
+def _segment_lock():
+    """
+    Serializes flushes / rotations across processes.
+    """
+    os.makedirs(AUDIT_SEGMENT_DIR, exist_ok=True)
+    with open(os.path.join(AUDIT_SEGMENT_DIR, ".lock"), "a") as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+
+def _rotate():
+    """
+    Renames the active file to the next segment and compresses it.
+    """
+    seq = max((s for s, _ in _segment_names()), default=0) + 1
+    plain = os.path.join(
+        AUDIT_SEGMENT_DIR, f"audit_logs.{seq:06d}.{_active_day()}.csv"
+    )
+    os.replace(AUDIT_FILE, plain)
+    _ACTIVE.update(ino=None, day=None)
+    _compress(plain)
+
+
+def _compress(plain):
+    """
+    plain -> plain.gz as one gzip member per AUDIT_BLOCK_BYTES of whole
+    records, written to a temp file and renamed; then plain is removed
+    and the index pointed at the members.
+    """
+    tmp = plain + ".gz.tmp"
+    members = []
+    with open(plain, "rb") as src, open(tmp, "wb") as dst:
+        block, base, size, count = [], 0, 0, 0
+        for offset, end, row in csv_index.iter_records(src, 0):
+            src.seek(offset)
+            block.append(src.read(end - offset))
+            size += end - offset
+            count += row != AUDIT_HEADER
+            if size >= AUDIT_BLOCK_BYTES:
+                members.append((dst.tell(), base, count))
+                dst.write(gzip.compress(b"".join(block)))
+                block, base, size, count = [], end, 0, 0
+        if block:
+            members.append((dst.tell(), base, count))
+            dst.write(gzip.compress(b"".join(block)))
+        dst.flush()
+        os.fsync(dst.fileno())
+    os.replace(tmp, plain + ".gz")
+    os.remove(plain)
+    audit_index.on_rotated(plain + ".gz", members, segments())
+
+
+def _finish_rotations():
+    """
+    Completes rotations interrupted between rename and compression.
+    """
+    for path in glob.glob(os.path.join(AUDIT_SEGMENT_DIR, "audit_logs.*.csv")):
+        if os.path.exists(path + ".gz"):
+            os.remove(path)
+        else:
+            _compress(path)
+
+
+def _segment_names():
+    names = {}
+    for path in glob.glob(os.path.join(AUDIT_SEGMENT_DIR, "audit_logs.*")):
+        m = SEGMENT_RE.search(path)
+        if m:
+            seq = int(m.group(1))
+            # a finished .gz wins over a leftover uncompressed copy
+            if seq not in names or m.group(3):
+                names[seq] = path
+    return sorted(names.items())
+
+
+atexit.register(flush)
+
+
+# =============================
+# READING
+# =============================
+def segments():
+    """
+    Segment paths, oldest first (the active file not included).
+    """
+    return [path for _, path in _segment_names()]
+
+
+def _rows(f):
+    for row in csv.reader(f):
+        if row and row != AUDIT_HEADER:
+            yield dict(zip(AUDIT_HEADER, row))
+
+
+def iter_entries():
+    """
+    Yields every audit entry as a dict (AUDIT_HEADER keys), oldest
+    first: compressed segments, then the active file. Entries still
+    buffered in this process are flushed first.
+    """
+    flush()
+    with _WRITE_LOCK, _segment_lock():
+        paths = segments()
+        active = open(AUDIT_FILE, "rb") if os.path.exists(AUDIT_FILE) else None
+        size = os.fstat(active.fileno()).st_size if active else 0
+
+    for path in paths:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", newline="", encoding="utf-8") as f:
+            yield from _rows(f)
+
+    if active:
+        with active:
+            text = io.TextIOWrapper(
+                io.BytesIO(active.read(size)), newline="", encoding="utf-8"
+            )
+            yield from _rows(text)
+
+
+# =============================
+# QUERIES
+# =============================
+def query(application_id=None, officer=None, start=None, end=None, limit=None):
+    """
+    Indexed lookup (see audit_index.query); buffered entries of this
+    process are flushed first.
+    """
+    flush()
+    with _WRITE_LOCK, _segment_lock():
+        audit_index.refresh()
+        return audit_index.query(application_id, officer, start, end, limit)
+
+
+def officers():
+    """
+    Officers with at least one audit entry.
+    """
+    flush()
+    return audit_index.officers()
@@ -3,12 +3,73 @@
 # =============================
 
 
-GOLD_RATE_PER_GRAM = 6000
+GOLD_RATE_PER_GRAM = 6000       # fallback when no rate source answers
 MAX_LTV = 0.75
 
+GOLD_LOAN_INTEREST_RATE = 9.95   # % p.a.
+DAY_COUNT_BASIS = 365            # year reckoned as 365 days
+MIN_INTEREST_DAYS = 7            # minimum interest period
+
 PURITY_FACTOR = {
     18: 0.75,
     20: 0.83,
     22: 0.92,
     24: 1.00
 }
+
+
+# =============================
+# KYC EXTRACTION CACHE
+# =============================
+KYC_CACHE_MAX_ENTRIES = 256
+KYC_CACHE_TTL_SECONDS = 24 * 60 * 60
+KYC_CACHE_FILE = "data/kyc_cache.jsonl"   # None = memory only
+
+
+# =============================
+# BACKGROUND KYC EXTRACTION
+# =============================
+KYC_MAX_WORKERS = 4
+KYC_MAX_PENDING = 32
+
+
+# =============================
+# KYC IMAGE NORMALIZATION
+# =============================
+KYC_IMAGE_MAX_DIMENSION = 1600   # longest side in pixels
+KYC_IMAGE_JPEG_QUALITY = 80
+
+
+# =============================
+# GOLD RATE SOURCE
+# =============================
+GOLD_RATE_SOURCE = "static"      # "static" | "file" | "http"
+GOLD_RATE_FILE = "data/gold_rate.json"
+GOLD_RATE_URL = "http://127.0.0.1:8766/rate"
+GOLD_RATE_TTL_SECONDS = 300
+
+
+# =============================
+# STORAGE BACKEND
+# =============================
+STORAGE_BACKEND = "csv"          # "csv" | "sqlite"
+SQLITE_FILE = "data/loan_assistant.db"   # migrate with tools.migrate_to_sqlite
+
+
+# =============================
+# GROUP COMMIT (officer decisions)
+# =============================
+GROUP_COMMIT_MAX_UNITS = 64      # decisions written per batch at most
+GROUP_COMMIT_WAIT_MS = 2         # wait for more decisions before writing
+
+
+# =============================
+# AUDIT LOG
+# =============================
+AUDIT_FLUSH_SECONDS = 1.0        # queued entries are written at least this often
+AUDIT_BUFFER_MAX_ENTRIES = 256   # ... or as soon as this many are queued
+AUDIT_FSYNC = True               # fsync every flush
+AUDIT_SEGMENT_DIR = "data/audit"
+AUDIT_SEGMENT_MAX_BYTES = 16 * 1024 * 1024   # rotate the active file past this
+AUDIT_ROTATE_DAILY = True        # ... or when the day changes
+AUDIT_BLOCK_BYTES = 64 * 1024    # uncompressed bytes per gzip member
@@ -0,0 +1,346 @@
+"""
+Persistent hash index over an append-only CSV master file.
+
+Each index maps one column value (e.g. Mobile, EmpCode) to the byte
+offsets of the rows holding it, so a lookup seeks straight to the row
+instead of re-parsing the whole file.
+
+Index file  : <csv name>.<field>.idx  (rows of: key, offset, end,
+              preceded by a generation token and the inode of the CSV
+              it was built from)
+Uniqueness  : append_unique_rows() checks and writes under one lock,
+              so an index can back a unique constraint.
+Maintenance : appends go through append_row(); rows written by anyone
+              else are picked up by scanning only the unindexed tail.
+Rewrites    : repository.replace_rows() deletes the index files
+              (drop_indexes), so every process sees its generation
+              token gone and starts over. A CSV rewritten behind our
+              back is caught by a new inode, a smaller size or, at the
+              same size, a new mtime (inodes are reused, so none of
+              these is proof alone); lookup() also drops any row whose
+              field does not hold the value asked for.
+"""
+
+import csv
+import glob
+import io
+import os
+import threading
+import uuid
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; the thread lock still applies
+    fcntl = None
+
+_INDEXES = {}
+_LOCK = threading.Lock()
+
+
+# =============================
+# RAW RECORD ACCESS
+# =============================
+def iter_records(f, start):
+    """
+    Yields (offset, end, row) for every complete CSV record from `start`.
+    Handles quoted fields that span several lines.
+    """
+    f.seek(start)
+    offset = start
+    buf = b""
+
+    for line in iter(f.readline, b""):
+        buf += line
+        if buf.count(b'"') % 2 or not buf.endswith(b"\n"):
+            continue
+
+        end = offset + len(buf)
+        text = buf.decode("utf-8", errors="ignore")
+        if text.strip():
+            yield offset, end, next(csv.reader(io.StringIO(text)))
+
+        offset = end
+        buf = b""
+
+
+def read_header(f):
+    for _, end, row in iter_records(f, 0):
+        return row, end
+    return [], 0
+
+
+def read_row_at(csv_path, offset):
+    """
+    Returns the row starting at byte `offset` as a dict, or None.
+    """
+    with open(csv_path, "rb") as f:
+        header, _ = read_header(f)
+        for _, _, row in iter_records(f, offset):
+            return dict(zip(header, row))
+    return None
+
+
+# =============================
+# INDEX BUILD / LOAD
+# =============================
+def index_path(csv_path, field):
+    base, _ = os.path.splitext(csv_path)
+    return f"{base}.{field.lower()}.idx"
+
+
+def _new_index(csv_path, field):
+    return {
+        "path": index_path(csv_path, field),
+        "keys": {},
+        "covered": 0,
+        "ino": None,
+        "mtime": None,      # of the CSV when last caught up
+        "gen": None,        # token in the index file's header
+        "file_stamp": None  # index file stat when its token was checked
+    }
+
+
+def _add(index, key, offset, end, persist):
+    index["keys"].setdefault(key, []).append(offset)
+    index["covered"] = end
+    persist.append([key, offset, end])
+
+
+def _stat_stamp(path):
+    st = os.stat(path)
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+
+def _persist(index, entries, truncate=False):
+    if not entries and not truncate:
+        return
+    fresh = truncate or not os.path.exists(index["path"])
+    mode = "w" if fresh else "a"
+    with open(index["path"], mode, newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        if fresh:
+            index["gen"] = uuid.uuid4().hex
+            writer.writerow(["#gen", index["gen"], index["ino"]])
+        writer.writerows(entries)
+    index["file_stamp"] = _stat_stamp(index["path"])
+
+
+def _load_from_disk(index):
+    if not os.path.exists(index["path"]):
+        return
+    with open(index["path"], newline="", encoding="utf-8") as f:
+        for row in csv.reader(f):
+            if len(row) == 3 and row[0] == "#gen":
+                index["gen"], index["ino"] = row[1], int(row[2])
+                continue
+            if len(row) != 3 or index["gen"] is None:
+                continue   # no token: older format, rebuilt by _catch_up
+            key, offset, end = row[0], int(row[1]), int(row[2])
+            offsets = index["keys"].setdefault(key, [])
+            # two processes may both have written the same tail
+            if not offsets or offset > offsets[-1]:
+                offsets.append(offset)
+            index["covered"] = max(index["covered"], end)
+    index["file_stamp"] = _stat_stamp(index["path"])
+
+
+def _stale(index):
+    """
+    True when the index file was dropped or rebuilt since this index
+    was loaded or last wrote to it.
+    """
+    if not os.path.exists(index["path"]):
+        return index["gen"] is not None
+    stamp = _stat_stamp(index["path"])
+    if stamp == index["file_stamp"]:
+        return False
+    with open(index["path"], newline="", encoding="utf-8") as f:
+        header = next(csv.reader(f), [])
+    if header[1:2] != [index["gen"]]:
+        return True
+    index["file_stamp"] = stamp
+    return False
+
+
+def _catch_up(index, csv_path, field):
+    """
+    Indexes rows appended past index["covered"].
+    Rebuilds from scratch if the CSV was replaced, shrank or was
+    rewritten in place at the same size.
+    """
+    if not os.path.exists(csv_path):
+        return
+
+    st = os.stat(csv_path)
+    size = st.st_size
+    truncate = (
+        index["gen"] is None    # new, or an index file without a token
+        or size < index["covered"]
+        or index["ino"] not in (None, st.st_ino)
+        or (size == index["covered"] and index["mtime"] not in (None, st.st_mtime_ns))
+    )
+    if truncate:
+        index["keys"].clear()
+        index["covered"] = 0
+    index["ino"] = st.st_ino
+    index["mtime"] = st.st_mtime_ns
+
+    if size == index["covered"] and not truncate:
+        return
+
+    entries = []
+    with open(csv_path, "rb") as f:
+        header, header_end = read_header(f)
+        if field not in header:
+            return
+        col = header.index(field)
+        start = max(index["covered"], header_end)
+        index["covered"] = start
+        for offset, end, row in iter_records(f, start):
+            _add(index, row[col] if col < len(row) else "", offset, end, entries)
+
+    _persist(index, entries, truncate=truncate)
+
+
+def drop_indexes(csv_path):
+    """
+    Forgets every index of a CSV that was cut back to an earlier size
+    (offsets past the cut may be reused); rebuilt on next lookup.
+    """
+    with _LOCK:
+        for key in [k for k in _INDEXES if k[0] == csv_path]:
+            del _INDEXES[key]
+        base, _ = os.path.splitext(csv_path)
+        for path in glob.glob(f"{glob.escape(base)}.*.idx"):
+            os.remove(path)
+
+
+def _get_index(csv_path, field):
+    key = (csv_path, field)
+    index = _INDEXES.get(key)
+    if index is None or _stale(index):
+        index = _new_index(csv_path, field)
+        _load_from_disk(index)
+        _INDEXES[key] = index
+    _catch_up(index, csv_path, field)
+    return index
+
+
+# =============================
+# PUBLIC API
+# =============================
+def offsets(csv_path, field, value):
+    """
+    Returns the byte offsets of rows whose `field` equals `value`,
+    without reading the rows themselves.
+    """
+    with _LOCK:
+        return list(_get_index(csv_path, field)["keys"].get(value, []))
+
+
+def lookup(csv_path, field, value):
+    """
+    Returns every row whose `field` equals `value`, in file order.
+    """
+    rows = (read_row_at(csv_path, o) for o in offsets(csv_path, field, value))
+    return [r for r in rows if r and r.get(field) == value]
+
+
+def _write_rows(f, rows, fsync):
+    f.seek(0, os.SEEK_END)
+    writer = csv.writer(f)
+    spans = []
+    for row in rows:
+        offset = f.tell()
+        writer.writerow(row)
+        spans.append((offset, f.tell()))
+    f.flush()
+    if fsync:
+        os.fsync(f.fileno())
+    return spans
+
+
+def _index_appended(csv_path, rows, spans):
+    for (path, field), index in list(_INDEXES.items()):
+        if path != csv_path or index["covered"] != spans[0][0]:
+            continue
+        if _stale(index):
+            del _INDEXES[(path, field)]
+            continue
+        with open(csv_path, "rb") as f:
+            header, _ = read_header(f)
+        if field not in header:
+            continue
+        col = header.index(field)
+        entries = []
+        for row, (offset, end) in zip(rows, spans):
+            _add(index, str(row[col]), offset, end, entries)
+        _persist(index, entries)
+        index["mtime"] = os.stat(csv_path).st_mtime_ns
+
+
+def append_rows(csv_path, rows, fsync=False):
+    """
+    Appends rows in one write and records them in every index already
+    open for that file. Returns the byte offset of each new row.
+    """
+    with _LOCK:
+        with open(csv_path, "a", newline="", encoding="utf-8") as f:
+            spans = _write_rows(f, rows, fsync)
+        if spans:
+            _index_appended(csv_path, rows, spans)
+
+    return [offset for offset, _ in spans]
+
+
+def append_unique_rows(csv_path, rows, unique_fields, fsync=False):
+    """
+    Appends the rows whose `unique_fields` values are neither in the
+    file nor earlier in `rows`. The check and the write happen under
+    the index lock and an exclusive lock on the CSV, so two writers
+    (sessions or processes) cannot both insert the same key.
+
+    Returns one (offset, None) per written row, or (None, field)
+    naming the first field that clashed.
+    """
+    with _LOCK:
+        with open(csv_path, "a", newline="", encoding="utf-8") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+
+            with open(csv_path, "rb") as rf:
+                header, _ = read_header(rf)
+            cols = [(field, header.index(field)) for field in unique_fields]
+            keys = {
+                field: _get_index(csv_path, field)["keys"]
+                for field in unique_fields
+            }
+
+            clashes, accepted, seen = [], [], set()
+            for row in rows:
+                clash = next((
+                    field for field, col in cols
+                    if str(row[col]) in keys[field]
+                    or (field, str(row[col])) in seen
+                ), None)
+                clashes.append(clash)
+                if clash is None:
+                    seen.update((field, str(row[col])) for field, col in cols)
+                    accepted.append(row)
+
+            spans = _write_rows(f, accepted, fsync)
+        if spans:
+            _index_appended(csv_path, accepted, spans)
+
+    offsets = iter(offset for offset, _ in spans)
+    return [
+        (None, clash) if clash else (next(offsets), None)
+        for clash in clashes
+    ]
+
+
+def append_row(csv_path, row):
+    """
+    Appends one row. Returns the byte offset of the new row.
+    """
+    return append_rows(csv_path, [row])[0]
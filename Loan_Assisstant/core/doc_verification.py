@@ -1,3 +1,4 @@
+import codecs
 import re
 
 def ocr_tool(file):
@@ -12,30 +13,88 @@ def ocr_tool(file):
         return ""
 
 
+# =============================
+# ENTITY EXTRACTION
+# =============================
+# One scanner for all fields: the alternation reports which field
+# matched (lastgroup), so a document is read in a single pass. The
+# leading lookahead lets the engine skip positions that cannot start
+# any field. Fields do not overlap: text used by one match is not
+# reused by another.
+ENTITY_RE = re.compile(
+    r"(?=[N0-9])(?:"
+    r"Name[:\- ]{1,10}(?P<name>[A-Za-z ]{1,100})"
+    r"|\b(?:(?P<dob>\d{2}[-/]\d{2}[-/]\d{4})"
+    r"|(?P<id_number>\d{4}\s?\d{4}\s?\d{4}))\b"
+    r")"
+)
+ENTITY_FIELDS = ("name", "dob", "id_number")
+MAX_MATCH = 128  # longest text ENTITY_RE can match
+CHUNK_SIZE = 64 * 1024
+
+
+def _scan(found, text, pos, final):
+    """
+    Records the first match of each field in text[pos:].
+    Returns None once every field is found, else the index the next
+    scan must resume from: matches that may continue past the end of
+    `text` are left for the next chunk.
+    """
+    safe_end = len(text) if final else len(text) - MAX_MATCH
+    for m in ENTITY_RE.finditer(text, pos):
+        if m.end() > safe_end:
+            return m.start()
+        field = m.lastgroup
+        if found[field] is None:
+            found[field] = m.group(field).strip()
+            if all(found.values()):
+                return None
+    return max(pos, safe_end)
+
+
 def ner_entity_extraction(text):
     """
     Lightweight NER using regex (NO external dependency).
     """
-    extracted = {
-        "name": None,
-        "dob": None,
-        "id_number": None
-    }
+    extracted = dict.fromkeys(ENTITY_FIELDS)
+    _scan(extracted, text, 0, True)
+    return extracted
 
-    name_match = re.search(r"Name[:\- ]+([A-Za-z ]+)", text)
-    dob_match = re.search(r"\b\d{2}[-/]\d{2}[-/]\d{4}\b", text)
-    aadhaar_match = re.search(r"\b\d{4}\s?\d{4}\s?\d{4}\b", text)
 
-    if name_match:
-        extracted["name"] = name_match.group(1).strip()
+def stream_entities(file, chunk_size=CHUNK_SIZE):
+    """
+    Same result as ner_entity_extraction(ocr_tool(file)), reading the
+    file in chunks and stopping as soon as all fields are found.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    extracted = dict.fromkeys(ENTITY_FIELDS)
+    text, pos = "", 0
 
-    if dob_match:
-        extracted["dob"] = dob_match.group()
+    while True:
+        chunk = file.read(chunk_size)
+        final = not chunk
+        if isinstance(chunk, bytes):
+            chunk = decoder.decode(chunk, final=final)
+        text += chunk
 
-    if aadhaar_match:
-        extracted["id_number"] = aadhaar_match.group()
+        resume = _scan(extracted, text, pos, final)
+        if resume is None or final:
+            return extracted
 
-    return extracted
+        # keep one character before the resume point so \b still
+        # sees what preceded it
+        keep = max(resume - 1, 0)
+        text, pos = text[keep:], resume - keep
+
+
+def extract_entities_batch(paths, chunk_size=CHUNK_SIZE):
+    """
+    Batch mode: yields (path, extracted) per document, one open
+    file and one chunk in memory at a time.
+    """
+    for path in paths:
+        with open(path, "rb") as f:
+            yield path, stream_entities(f, chunk_size)
 
 
 def identity_consistency_check(extracted, customer):
@@ -1,3 +1,6 @@
+from functools import lru_cache
+
+
 def emi_calculation_agent(loan_amount, annual_rate, tenure_months):
     """
     EMI Agent:
@@ -7,13 +10,25 @@ def emi_calculation_agent(loan_amount, annual_rate, tenure_months):
 
     monthly_rate = annual_rate / 12 / 100
 
-    emi = (
-        loan_amount * monthly_rate * (1 + monthly_rate) ** tenure_months
-    ) / (
-        (1 + monthly_rate) ** tenure_months - 1
-    )
+    if monthly_rate == 0:
+        emi = loan_amount / tenure_months
+    else:
+        emi = (
+            loan_amount * monthly_rate * (1 + monthly_rate) ** tenure_months
+        ) / (
+            (1 + monthly_rate) ** tenure_months - 1
+        )
+
+    return int(emi), emi_explanation(loan_amount, annual_rate, tenure_months)
+
+
+def emi_explanation(loan_amount, annual_rate, tenure_months):
+    """
+    Audit-friendly explanation of an EMI quote.
+    """
+    monthly_rate = annual_rate / 12 / 100
 
-    explanation = {
+    return {
         "Loan Amount": loan_amount,
         "Tenure (Months)": tenure_months,
         "Annual Interest Rate (%)": annual_rate,
@@ -26,4 +41,90 @@ def emi_calculation_agent(loan_amount, annual_rate, tenure_months):
         )
     }
 
-    return int(emi), explanation
\ No newline at end of file
+
+def emi_batch(loan_amounts, annual_rates, tenure_months):
+    """
+    Vectorized EMI for many loans at once (quotes, portfolio analytics,
+    officer re-checks). Inputs are array-likes that broadcast together.
+
+    EMIs match emi_calculation_agent exactly (same formula, truncated
+    to whole rupees); zero-rate loans are repaid as P / n. As in the
+    amortization schedule, the final installment clears the balance
+    the truncated EMIs leave, so totals are those of the full repayment
+    (rounded once, to paise; interest never below zero).
+
+    Returns dict of arrays: emi (int64), total_payable and
+    total_interest (float64).
+    """
+    import numpy as np
+
+    p = np.asarray(loan_amounts, dtype=np.float64)
+    n = np.asarray(tenure_months, dtype=np.float64)
+    r = np.asarray(annual_rates, dtype=np.float64) / 12 / 100
+
+    growth = (1 + r) ** n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        emi = np.where(r == 0, p / n, (p * r * growth) / (growth - 1))
+    emi = np.trunc(emi).astype(np.int64)
+
+    # Balance left after n - 1 installments, paid off with interest
+    # by the last one
+    before_last = (1 + r) ** (n - 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        balance = np.where(
+            r == 0,
+            p - emi * (n - 1),
+            p * before_last - emi * (before_last - 1) / r
+        )
+    total_payable = np.round(emi * (n - 1) + balance * (1 + r), 2)
+
+    return {
+        "emi": emi,
+        "total_payable": total_payable,
+        "total_interest": np.maximum(np.round(total_payable - p, 2), 0)
+    }
+
+
+@lru_cache(maxsize=64)
+def emi_grid(max_amount, annual_rate, min_amount=20000, step=1000,
+             max_tenure=36):
+    """
+    Precomputed what-if grid for the loan sliders: every `step` amount
+    from min_amount up to max_amount (max_amount itself included) times
+    tenures 1..max_tenure, in one emi_batch pass. Memoized, so each
+    (max_amount, rate) pair is computed once.
+
+    Returns dict with:
+    - amounts, tenures : grid axes (lists)
+    - row              : {amount: row index} for O(1) lookups
+    - emi, total_interest : 2-D arrays [amount row, tenure - 1]
+    """
+    import numpy as np
+
+    amounts = list(range(min_amount, max_amount + 1, step))
+    if amounts[-1] != max_amount:
+        amounts.append(max_amount)
+    tenures = list(range(1, max_tenure + 1))
+
+    result = emi_batch(
+        np.array(amounts)[:, None],
+        annual_rate,
+        np.array(tenures)[None, :]
+    )
+
+    return {
+        "amounts": amounts,
+        "tenures": tenures,
+        "row": {a: i for i, a in enumerate(amounts)},
+        "emi": result["emi"],
+        "total_interest": result["total_interest"]
+    }
+
+
+def grid_lookup(grid, loan_amount, tenure_months):
+    """
+    Returns (emi, total_interest) for a slider position.
+    """
+    i = grid["row"][loan_amount]
+    j = tenure_months - 1
+    return int(grid["emi"][i, j]), float(grid["total_interest"][i, j])
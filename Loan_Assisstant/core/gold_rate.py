@@ -0,0 +1,146 @@
+"""
+Gold rate provider with a shared TTL cache.
+
+Sources (GOLD_RATE_SOURCE):
+- "static" : GOLD_RATE_PER_GRAM from config
+- "file"   : JSON file {"rate_per_gram": ..., "as_of": ...}
+- "http"   : GET GOLD_RATE_URL returning the same JSON
+             (tools/stub_rate_server.py is a local stand-in)
+
+current_rate() never blocks on the source: a fresh cached value is
+returned as is; a stale one is returned immediately while a single
+background thread refreshes it (stale-while-revalidate). Before the
+first fetch completes the static config rate is served.
+"""
+
+import json
+import threading
+import time
+import urllib.request
+from datetime import datetime
+
+from core.config import (
+    GOLD_RATE_PER_GRAM,
+    GOLD_RATE_SOURCE,
+    GOLD_RATE_FILE,
+    GOLD_RATE_URL,
+    GOLD_RATE_TTL_SECONDS
+)
+from core.repository import append_row, ensure_table
+
+RATE_SNAPSHOT_FILE = "data/rate_snapshots.csv"
+RATE_SNAPSHOT_HEADER = ["Application_ID", "Gold_Rate", "Source", "As_Of"]
+
+
+# =============================
+# PROVIDERS
+# =============================
+class StaticRateProvider:
+    name = "static"
+
+    def fetch(self):
+        return {"rate_per_gram": GOLD_RATE_PER_GRAM, "as_of": None}
+
+
+class FileRateProvider:
+    name = "file"
+
+    def __init__(self, path=GOLD_RATE_FILE):
+        self.path = path
+
+    def fetch(self):
+        with open(self.path, encoding="utf-8") as f:
+            return json.load(f)
+
+
+class HttpRateProvider:
+    name = "http"
+
+    def __init__(self, url=GOLD_RATE_URL, timeout=5):
+        self.url = url
+        self.timeout = timeout
+
+    def fetch(self):
+        with urllib.request.urlopen(self.url, timeout=self.timeout) as resp:
+            return json.loads(resp.read().decode("utf-8"))
+
+
+PROVIDERS = {
+    "static": StaticRateProvider,
+    "file": FileRateProvider,
+    "http": HttpRateProvider
+}
+
+
+# =============================
+# SHARED CACHE
+# =============================
+_STATE = {
+    "provider": PROVIDERS[GOLD_RATE_SOURCE](),
+    "snapshot": None,
+    "refreshing": False
+}
+_LOCK = threading.Lock()
+
+
+def set_provider(provider):
+    with _LOCK:
+        _STATE["provider"] = provider
+        _STATE["snapshot"] = None
+
+
+def _snapshot(data, source):
+    now = time.time()
+    return {
+        "rate": float(data["rate_per_gram"]),
+        "as_of": data.get("as_of") or datetime.fromtimestamp(now).isoformat(),
+        "source": source,
+        "fetched_at": now
+    }
+
+
+def _refresh():
+    provider = _STATE["provider"]
+    try:
+        snapshot = _snapshot(provider.fetch(), provider.name)
+    except Exception:
+        snapshot = None
+    with _LOCK:
+        if snapshot:
+            _STATE["snapshot"] = snapshot
+        _STATE["refreshing"] = False
+
+
+def _refresh_in_background():
+    if _STATE["refreshing"]:
+        return
+    _STATE["refreshing"] = True
+    threading.Thread(target=_refresh, name="gold-rate", daemon=True).start()
+
+
+def current_rate():
+    """
+    Returns the rate snapshot: {rate, as_of, source, fetched_at}.
+    Never waits for the provider.
+    """
+    with _LOCK:
+        snapshot = _STATE["snapshot"]
+        if snapshot is None:
+            _refresh_in_background()
+            return _snapshot(StaticRateProvider().fetch(), "static-fallback")
+        if time.time() - snapshot["fetched_at"] > GOLD_RATE_TTL_SECONDS:
+            _refresh_in_background()
+        return dict(snapshot)
+
+
+def record_rate_snapshot(application_id, snapshot):
+    """
+    Stores the rate an application was valued at.
+    """
+    ensure_table(RATE_SNAPSHOT_FILE, RATE_SNAPSHOT_HEADER)
+    append_row(RATE_SNAPSHOT_FILE, [
+        application_id,
+        snapshot["rate"],
+        snapshot["source"],
+        snapshot["as_of"]
+    ])
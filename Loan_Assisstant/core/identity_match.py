@@ -0,0 +1,265 @@
+"""
+Duplicate-identity and fraud-ring detection over the customer master.
+
+Comparing every pair of customers is quadratic, so records are first
+grouped by blocking keys and only records sharing a block are compared:
+
+- n|DOB|Soundex of a name token : similar-sounding names born on
+                                  the same day
+- l|Aadhaar last-4|DOB           : same ID tail and DOB, any name
+- m|Aadhaar last-4|Mobile,
+  p|Aadhaar last-4|PAN           : same ID tail and contact, any name
+                                  or DOB
+- a|full Aadhaar                 : same ID number, any name
+
+An ID tail alone is shared by chance (1 in 10,000), so "same Aadhaar
+last-4, different name" needs a second link -- the same DOB, Mobile or
+PAN -- and the l|, m| and p| blocks hold exactly the pairs that can
+have one.
+
+Blocks larger than MAX_BLOCK_SIZE (e.g. a placeholder DOB) are skipped
+and counted instead of compared. Candidate pairs are scored on name
+similarity (character-bigram Dice) and shared DOB / ID / contact
+fields; flagged pairs are linked into rings (connected components),
+so one identity reused across several profiles shows up as one group.
+
+The report is written to data/identity_report.csv for the officer
+dashboard (tools/identity_report.py rebuilds it).
+"""
+
+import re
+from datetime import datetime
+from functools import lru_cache
+from itertools import combinations
+
+from core.repository import CUSTOMER_FILE, find_rows, read_rows, replace_rows
+
+REPORT_FILE = "data/identity_report.csv"
+REPORT_HEADER = [
+    "Ring_ID", "Customer_A", "Customer_B", "Name_A", "Name_B",
+    "DOB_A", "DOB_B", "Score", "Reason", "Generated_At"
+]
+
+MAX_BLOCK_SIZE = 200
+SIMILAR_NAME = 0.8
+DIFFERENT_NAME = 0.5
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6"
+}
+_NON_LETTERS = re.compile(r"[^a-z ]+")
+
+
+# =============================
+# KEYS
+# =============================
+@lru_cache(maxsize=65536)
+def soundex(word):
+    """
+    American Soundex code of a lowercase word ("" for empty input).
+    """
+    if not word:
+        return ""
+    code = word[0].upper()
+    previous = _SOUNDEX_CODES.get(word[0], "")
+    for ch in word[1:]:
+        digit = _SOUNDEX_CODES.get(ch, "")
+        if digit and digit != previous:
+            code += digit
+        if ch not in "hw":
+            previous = digit
+    return (code + "000")[:4]
+
+
+def normalize_name(name):
+    return " ".join(_NON_LETTERS.sub(" ", (name or "").lower()).split())
+
+
+@lru_cache(maxsize=65536)
+def name_bigrams(name):
+    padded = f" {name} "
+    return frozenset(padded[i:i + 2] for i in range(len(padded) - 1))
+
+
+def blocking_keys(record):
+    """
+    Block keys of one prepared record, as short strings.
+    """
+    dob = record["DOB"]
+    aadhaar = record["Aadhaar"]
+    keys = set()
+    if dob:
+        keys.update(
+            f"n|{dob}|{soundex(token)}"
+            for token in record["_name"].split() if len(token) > 1
+        )
+    if len(aadhaar) >= 4:
+        keys.add(f"l|{aadhaar[-4:]}|{dob}")
+        keys.add(f"a|{aadhaar}")
+        if record["Mobile"]:
+            keys.add(f"m|{aadhaar[-4:]}|{record['Mobile']}")
+        if record["PAN"]:
+            keys.add(f"p|{aadhaar[-4:]}|{record['PAN']}")
+    return keys
+
+
+# =============================
+# CANDIDATES AND SCORING
+# =============================
+def _prepare(customers):
+    records = []
+    for c in customers:
+        record = {f: (c.get(f) or "").strip() for f in (
+            "Customer_ID", "Full_Name", "DOB", "Mobile", "PAN", "Aadhaar"
+        )}
+        record["_name"] = normalize_name(record["Full_Name"])
+        records.append(record)
+    return records
+
+
+def candidate_pairs(records, max_block=MAX_BLOCK_SIZE):
+    """
+    Returns (set of index pairs i < j, number of oversized blocks).
+    """
+    # most blocks hold a single record: keep those as a bare index
+    blocks = {}
+    for i, record in enumerate(records):
+        for key in blocking_keys(record):
+            members = blocks.get(key)
+            if members is None:
+                blocks[key] = i
+            elif type(members) is int:
+                blocks[key] = [members, i]
+            else:
+                members.append(i)
+
+    pairs, skipped = set(), 0
+    for members in blocks.values():
+        if type(members) is int:
+            continue
+        if len(members) > max_block:
+            skipped += 1
+            continue
+        pairs.update(combinations(members, 2))
+    return pairs, skipped
+
+
+def name_similarity(a, b):
+    grams_a, grams_b = name_bigrams(a["_name"]), name_bigrams(b["_name"])
+    if not a["_name"] or not b["_name"]:
+        return 0.0
+    return 2 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+
+
+def score_pair(a, b):
+    """
+    Returns (score in [0, 1], reason) or (score, None) when the pair
+    does not look like a duplicate identity.
+    """
+    similarity = name_similarity(a, b)
+    same_dob = bool(a["DOB"]) and a["DOB"] == b["DOB"]
+    same_id = bool(a["Aadhaar"]) and a["Aadhaar"] == b["Aadhaar"]
+    same_last4 = len(a["Aadhaar"]) >= 4 and a["Aadhaar"][-4:] == b["Aadhaar"][-4:]
+    shared_contact = any(
+        a[f] and a[f] == b[f] for f in ("Mobile", "PAN")
+    )
+
+    score = round(
+        0.5 * similarity + 0.2 * same_dob + 0.2 * same_last4
+        + 0.1 * shared_contact, 3
+    )
+
+    if same_id and similarity < SIMILAR_NAME:
+        reason = "Same Aadhaar, different name"
+    elif same_dob and similarity >= SIMILAR_NAME:
+        reason = "Similar name, same DOB"
+    elif same_last4 and similarity < DIFFERENT_NAME and (same_dob or shared_contact):
+        reason = "Same Aadhaar last-4, different name"
+    else:
+        reason = None
+    return score, reason
+
+
+def _rings(pairs, count):
+    parent = list(range(count))
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in pairs:
+        parent[root(i)] = root(j)
+    return root
+
+
+# =============================
+# REPORT
+# =============================
+def find_duplicates(customers=None):
+    """
+    Scores all candidate pairs of the customer master.
+    Returns (report rows sorted by ring and score, stats dict).
+    """
+    if customers is None:
+        customers = read_rows(CUSTOMER_FILE)
+    records = _prepare(customers)
+    pairs, skipped = candidate_pairs(records)
+
+    flagged = []
+    for i, j in pairs:
+        score, reason = score_pair(records[i], records[j])
+        if reason:
+            flagged.append((i, j, score, reason))
+
+    root = _rings([(i, j) for i, j, _, _ in flagged], len(records))
+    ring_ids = {}
+    generated_at = datetime.now().isoformat(timespec="seconds")
+
+    rows = []
+    for i, j, score, reason in flagged:
+        ring = ring_ids.setdefault(root(i), f"R{len(ring_ids) + 1:05d}")
+        a, b = records[i], records[j]
+        rows.append({
+            "Ring_ID": ring,
+            "Customer_A": a["Customer_ID"],
+            "Customer_B": b["Customer_ID"],
+            "Name_A": a["Full_Name"],
+            "Name_B": b["Full_Name"],
+            "DOB_A": a["DOB"],
+            "DOB_B": b["DOB"],
+            "Score": score,
+            "Reason": reason,
+            "Generated_At": generated_at
+        })
+    rows.sort(key=lambda r: (r["Ring_ID"], -r["Score"]))
+
+    stats = {
+        "customers": len(records),
+        "candidate_pairs": len(pairs),
+        "oversized_blocks": skipped,
+        "flagged_pairs": len(rows),
+        "rings": len(ring_ids)
+    }
+    return rows, stats
+
+
+def write_report(rows, path=REPORT_FILE):
+    replace_rows(path, REPORT_HEADER, [[r[k] for k in REPORT_HEADER] for r in rows])
+
+
+def report_for_customer(customer_id, path=REPORT_FILE):
+    """
+    Flagged pairs involving one customer (index lookups on the
+    stored report).
+    """
+    return (
+        find_rows(path, "Customer_A", customer_id)
+        + find_rows(path, "Customer_B", customer_id)
+    )
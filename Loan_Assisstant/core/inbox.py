@@ -0,0 +1,73 @@
+"""
+Per-customer notification inbox.
+
+Messages stay in data/notifications.csv; a Customer_ID index over it
+gives each customer's row positions, so the home page reads only that
+customer's messages. A "last seen" cursor per customer is kept in an
+append-only table and answers the unread badge from the positions
+alone.
+"""
+
+from datetime import datetime
+
+from core.repository import (
+    NOTIFY_FILE,
+    NOTIFY_HEADER,
+    append_row,
+    ensure_table,
+    find_rows,
+    positions
+)
+
+CURSOR_FILE = "data/notification_cursors.csv"
+CURSOR_HEADER = ["Customer_ID", "Last_Seen_Offset", "Seen_At"]
+
+
+def notification(customer_id, application_id, sender, message):
+    """
+    The (path, row) of a message, for writing together with other rows
+    through core.group_commit.
+    """
+    ensure_table(NOTIFY_FILE, NOTIFY_HEADER)
+    return NOTIFY_FILE, [
+        customer_id,
+        application_id,
+        sender,
+        message,
+        datetime.now().isoformat()
+    ]
+
+
+def inbox(customer_id):
+    """
+    Returns the customer's notifications, oldest first.
+    """
+    return find_rows(NOTIFY_FILE, "Customer_ID", customer_id)
+
+
+def _last_seen(customer_id):
+    cursors = find_rows(CURSOR_FILE, "Customer_ID", customer_id)
+    return int(cursors[-1]["Last_Seen_Offset"]) if cursors else -1
+
+
+def unread_count(customer_id):
+    """
+    Number of notifications newer than the customer's cursor.
+    """
+    last_seen = _last_seen(customer_id)
+    return sum(
+        1 for o in positions(NOTIFY_FILE, "Customer_ID", customer_id)
+        if o > last_seen
+    )
+
+
+def mark_seen(customer_id):
+    """
+    Moves the cursor to the customer's newest notification.
+    Only writes when there is something new to acknowledge.
+    """
+    own = positions(NOTIFY_FILE, "Customer_ID", customer_id)
+    if not own or own[-1] <= _last_seen(customer_id):
+        return
+    ensure_table(CURSOR_FILE, CURSOR_HEADER)
+    append_row(CURSOR_FILE, [customer_id, own[-1], datetime.now().isoformat()])
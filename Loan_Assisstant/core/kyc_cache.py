@@ -0,0 +1,115 @@
+"""
+Cache for vision KYC extraction results.
+
+Key   : sha256(image bytes) + model name + prompt version + image
+        normalization settings, so a changed model, prompt or
+        normalization never serves an old answer.
+Evict : least-recently-used beyond KYC_CACHE_MAX_ENTRIES, and anything
+        older than KYC_CACHE_TTL_SECONDS.
+Disk  : optional JSON-lines file (KYC_CACHE_FILE); entries survive
+        restarts and the file is rewritten when it holds too many
+        superseded lines.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from core.config import (
+    KYC_CACHE_MAX_ENTRIES,
+    KYC_CACHE_TTL_SECONDS,
+    KYC_CACHE_FILE
+)
+
+_ENTRIES = OrderedDict()
+_STATE = {"loaded": False, "disk_lines": 0}
+_LOCK = threading.Lock()
+
+
+def cache_key(file_bytes, model, prompt_version, normalization):
+    digest = hashlib.sha256(file_bytes).hexdigest()
+    return f"{digest}:{model}:{prompt_version}:{normalization}"
+
+
+def _expired(created):
+    return time.time() - created > KYC_CACHE_TTL_SECONDS
+
+
+def _evict():
+    for key in [k for k, e in _ENTRIES.items() if _expired(e["created"])]:
+        del _ENTRIES[key]
+    while len(_ENTRIES) > KYC_CACHE_MAX_ENTRIES:
+        _ENTRIES.popitem(last=False)
+
+
+# =============================
+# DISK PERSISTENCE
+# =============================
+def _load():
+    _STATE["loaded"] = True
+    if not KYC_CACHE_FILE or not os.path.exists(KYC_CACHE_FILE):
+        return
+
+    with open(KYC_CACHE_FILE, encoding="utf-8") as f:
+        for line in f:
+            _STATE["disk_lines"] += 1
+            try:
+                e = json.loads(line)
+            except ValueError:
+                continue
+            _ENTRIES[e["key"]] = {"created": e["created"], "result": e["result"]}
+            _ENTRIES.move_to_end(e["key"])
+    _evict()
+
+
+def _write_line(f, key, entry):
+    f.write(json.dumps({"key": key, **entry}) + "\n")
+
+
+def _persist(key, entry):
+    if not KYC_CACHE_FILE:
+        return
+
+    if _STATE["disk_lines"] >= 2 * KYC_CACHE_MAX_ENTRIES:
+        tmp = KYC_CACHE_FILE + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for k, e in _ENTRIES.items():
+                _write_line(f, k, e)
+        os.replace(tmp, KYC_CACHE_FILE)
+        _STATE["disk_lines"] = len(_ENTRIES)
+        return
+
+    with open(KYC_CACHE_FILE, "a", encoding="utf-8") as f:
+        _write_line(f, key, entry)
+    _STATE["disk_lines"] += 1
+
+
+# =============================
+# PUBLIC API
+# =============================
+def get(key):
+    with _LOCK:
+        if not _STATE["loaded"]:
+            _load()
+        entry = _ENTRIES.get(key)
+        if entry is None:
+            return None
+        if _expired(entry["created"]):
+            del _ENTRIES[key]
+            return None
+        _ENTRIES.move_to_end(key)
+        return entry["result"]
+
+
+def put(key, result):
+    with _LOCK:
+        if not _STATE["loaded"]:
+            _load()
+        entry = {"created": time.time(), "result": result}
+        _ENTRIES[key] = entry
+        _ENTRIES.move_to_end(key)
+        _evict()
+        _persist(key, entry)
@@ -0,0 +1,194 @@
+"""
+Background KYC extraction.
+
+Vision-model calls run on a small shared thread pool instead of the
+Streamlit script thread. submit_extraction() returns a job id (the
+image's content hash, so reruns re-attach to the same job) and
+job_status() is polled by the page. Results that arrive after the
+application was submitted are written to KYC_RESULT_FILE and overlaid
+on the application when the officer opens it.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from core.config import KYC_MAX_WORKERS, KYC_MAX_PENDING
+from core.repository import (
+    APP_FILE,
+    append_row,
+    append_rows,
+    ensure_table,
+    find_one,
+    find_rows
+)
+from core.scoring import score_and_save
+from core.vision_kyc import extract_identity_from_image
+
+KYC_RESULT_FILE = "data/kyc_results.csv"
+KYC_RESULT_HEADER = [
+    "Application_ID", "Extracted_Name", "Extracted_DOB",
+    "Extracted_ID_Last4", "Document_Failure_Reason", "Completed_At"
+]
+
+EMPTY_EXTRACTION_REASON = (
+    "Identity details could not be confidently extracted from document."
+)
+
+# Finished jobs kept for polling before the oldest are forgotten
+_MAX_TRACKED_JOBS = 256
+
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=KYC_MAX_WORKERS, thread_name_prefix="kyc"
+)
+_JOBS = OrderedDict()
+_LOCK = threading.Lock()
+
+
+def _run(file_bytes):
+    try:
+        return extract_identity_from_image(file_bytes)
+    except Exception as e:
+        return None, f"Extraction failed: {e}"
+
+
+def _failed(future):
+    return future.done() and future.result()[1] is not None
+
+
+def _forget_finished():
+    for job_id in list(_JOBS):
+        if len(_JOBS) <= _MAX_TRACKED_JOBS:
+            break
+        if _JOBS[job_id].done():
+            del _JOBS[job_id]
+
+
+# =============================
+# JOBS
+# =============================
+def submit_extraction(file_bytes):
+    """
+    Queues extraction for an image and returns its job id. A job that
+    ended in an error (e.g. a transient API failure) is dropped and
+    queued again, so submitting the same image retries it.
+    Returns None when the pool is busy (KYC_MAX_PENDING jobs waiting);
+    the caller should ask the user to try again shortly.
+    """
+    job_id = hashlib.sha256(file_bytes).hexdigest()
+
+    with _LOCK:
+        job = _JOBS.get(job_id)
+        if job is not None and not _failed(job):
+            return job_id
+
+        pending = sum(1 for f in _JOBS.values() if not f.done())
+        if pending >= KYC_MAX_PENDING:
+            return None
+
+        _JOBS.pop(job_id, None)
+        _JOBS[job_id] = _EXECUTOR.submit(_run, file_bytes)
+        _forget_finished()
+
+    return job_id
+
+
+def job_status(job_id):
+    """
+    Returns (state, extracted, error) where state is
+    PENDING / DONE / UNKNOWN.
+    """
+    with _LOCK:
+        future = _JOBS.get(job_id)
+
+    if future is None:
+        return "UNKNOWN", None, "Extraction job not found"
+    if not future.done():
+        return "PENDING", None, None
+
+    extracted, error = future.result()
+    return "DONE", extracted, error
+
+
+def extraction_failure_reason(extracted, error):
+    if error:
+        return error
+    if not extracted.get("name") and not extracted.get("aadhaar_last4"):
+        return EMPTY_EXTRACTION_REASON
+    return ""
+
+
+# =============================
+# LATE RESULTS
+# =============================
+def _result_row(application_id, extracted, error):
+    extracted = extracted or {}
+    return [
+        application_id,
+        extracted.get("name", ""),
+        extracted.get("dob", ""),
+        extracted.get("aadhaar_last4", ""),
+        extraction_failure_reason(extracted, error),
+        datetime.now().isoformat()
+    ]
+
+
+def _rescore(application_id):
+    # Re-score now that the extracted identity is known
+    app = find_one(APP_FILE, "Application_ID", application_id)
+    if app:
+        score_and_save(with_late_result(app))
+
+
+def _record_result(application_id, future):
+    append_row(KYC_RESULT_FILE, _result_row(application_id, *future.result()))
+    _rescore(application_id)
+
+
+def record_results(results):
+    """
+    Bulk write of (application_id, extracted, error) tuples:
+    one append and one fsync for the whole batch, then each
+    application is re-scored.
+    """
+    _init_result_file()
+    append_rows(
+        KYC_RESULT_FILE,
+        [_result_row(*r) for r in results],
+        fsync=True
+    )
+    for application_id in dict.fromkeys(r[0] for r in results):
+        _rescore(application_id)
+
+
+def attach_when_done(job_id, application_id):
+    """
+    Records the job's result against the application once it completes
+    (immediately if it already has).
+    """
+    with _LOCK:
+        future = _JOBS.get(job_id)
+    if future is None:
+        return
+    _init_result_file()
+    future.add_done_callback(lambda f: _record_result(application_id, f))
+
+
+def _init_result_file():
+    ensure_table(KYC_RESULT_FILE, KYC_RESULT_HEADER)
+
+
+def with_late_result(app):
+    """
+    Returns the application row with any background KYC result applied.
+    """
+    results = find_rows(KYC_RESULT_FILE, "Application_ID", app["Application_ID"])
+    if not results:
+        return app
+    latest = results[-1]
+    return {
+        **app,
+        **{k: latest[k] for k in KYC_RESULT_HEADER[1:5]}
+    }
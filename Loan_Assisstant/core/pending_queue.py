@@ -0,0 +1,168 @@
+"""
+Pending-application queue for the officer dashboard.
+
+Holds only applications in a pending status together with the
+position of their row in applications.csv (byte offset, or rowid on
+the SQLite store), so the dashboard reads the pending set directly
+instead of scanning the full history.
+
+Queue file : data/pending_queue.csv  (Application_ID, Offset, Status),
+             plus one COVERED_MARKER row naming the last application
+             row the queue has seen (its position and Application_ID)
+Updated by : customer submission (enqueue) and officer status changes
+             (on_status_change). Every read also queues rows appended
+             past the covered one, so an application whose enqueue was
+             lost (crash or error right after the append) still shows
+             up. A missing or stale queue (e.g. after status-log
+             compaction rewrote applications.csv, so the covered row
+             moved) is rebuilt.
+"""
+
+import csv
+import os
+import threading
+
+from core.repository import APP_FILE, row_at, rows_after
+from core.status_log import current_statuses
+
+QUEUE_FILE = "data/pending_queue.csv"
+QUEUE_HEADER = ["Application_ID", "Offset", "Status"]
+COVERED_MARKER = "#covered"
+PENDING_STATUSES = ("SUBMITTED", "UNDER_REVIEW")
+
+_LOCK = threading.Lock()
+
+
+# =============================
+# STORAGE
+# =============================
+def _load():
+    """
+    Returns (queue, covered) where covered is (position, Application_ID)
+    of the last application row seen, or None (queue predates it).
+    """
+    queue, covered = {}, None
+    with open(QUEUE_FILE, newline="", encoding="utf-8") as f:
+        for r in csv.DictReader(f):
+            if r["Application_ID"] == COVERED_MARKER:
+                covered = (int(r["Offset"]), r["Status"])
+                continue
+            queue[r["Application_ID"]] = {
+                "offset": int(r["Offset"]),
+                "status": r["Status"]
+            }
+    return queue, covered
+
+
+def _save(queue, covered):
+    tmp = QUEUE_FILE + ".tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(QUEUE_HEADER)
+        writer.writerow([COVERED_MARKER, *covered])
+        for app_id, q in queue.items():
+            writer.writerow([app_id, q["offset"], q["status"]])
+    os.replace(tmp, QUEUE_FILE)
+
+
+def _scan(queue, position):
+    """
+    Queues pending rows past `position` (folded statuses). Returns the
+    new covered (position, Application_ID).
+    """
+    covered = (position, "")
+    statuses = current_statuses()
+    for position, row in rows_after(APP_FILE, position):
+        status = statuses.get(row["Application_ID"], row["Status"])
+        if status in PENDING_STATUSES:
+            queue[row["Application_ID"]] = {"offset": position, "status": status}
+        covered = (position, row["Application_ID"])
+    return covered
+
+
+def _rebuild():
+    """
+    Full scan of applications.csv. Only used when the queue is missing
+    or no longer matches the applications file.
+    """
+    queue = {}
+    covered = _scan(queue, -1)
+    _save(queue, covered)
+    return queue, covered
+
+
+def _covers(covered):
+    position, app_id = covered
+    if position < 0:
+        return True
+    row = row_at(APP_FILE, position)
+    return bool(row) and row.get("Application_ID") == app_id
+
+
+def _queue():
+    """
+    The queue, brought level with applications.csv.
+    """
+    if not os.path.exists(QUEUE_FILE):
+        return _rebuild()
+    queue, covered = _load()
+    if covered is None or not _covers(covered):
+        return _rebuild()
+    tail = _scan(queue, covered[0])
+    if tail[0] != covered[0]:
+        covered = tail
+        _save(queue, covered)
+    return queue, covered
+
+
+# =============================
+# PUBLIC API
+# =============================
+def enqueue(application_id, offset, status="SUBMITTED"):
+    with _LOCK:
+        queue, covered = _queue()
+        queue[application_id] = {"offset": offset, "status": status}
+        _save(queue, covered)
+
+
+def on_status_change(application_id, new_status):
+    """
+    Keeps the queue in step with a status transition: pending statuses
+    are updated in place, anything else leaves the queue.
+    """
+    with _LOCK:
+        queue, covered = _queue()
+        if application_id not in queue:
+            return
+        if new_status in PENDING_STATUSES:
+            queue[application_id]["status"] = new_status
+        else:
+            del queue[application_id]
+        _save(queue, covered)
+
+
+def _read_rows(queue):
+    """
+    Returns the queued rows, or None if an offset no longer points at
+    the expected application.
+    """
+    rows = []
+    for app_id, q in sorted(queue.items(), key=lambda x: x[1]["offset"]):
+        row = row_at(APP_FILE, q["offset"])
+        if not row or row.get("Application_ID") != app_id:
+            return None
+        row["Status"] = q["status"]
+        rows.append(row)
+    return rows
+
+
+def pending_applications():
+    """
+    Returns pending application rows in submission order.
+    Reads one row per queued application.
+    """
+    with _LOCK:
+        rows = _read_rows(_queue()[0])
+        if rows is None:
+            rows = _read_rows(_rebuild()[0])
+        return rows
@@ -0,0 +1,457 @@
+"""
+Shared data-access layer.
+
+Tables are named by their CSV path (CUSTOMER_FILE etc.) whichever
+backend is active (STORAGE_BACKEND in config, or set_backend()):
+
+- "csv"    : the files under data/ (this module + core.csv_index)
+- "sqlite" : one table per file in SQLITE_FILE (core.sqlite_store)
+
+For the CSV store:
+
+- read_rows()   : full-table reads, parsed once and kept in a process-wide
+                  cache (shared by all Streamlit sessions). An entry is
+                  dropped when the file's mtime or size changes.
+- find_rows()   : point lookups through the persistent indexes in
+                  core.csv_index (no parsing of the master file).
+- append_rows() : writes go through here so both the indexes and the
+                  cached rows are updated in place, without a re-parse.
+                  append_unique_rows() additionally enforces unique
+                  columns (customer Mobile / PAN / Aadhaar).
+
+A row's position (returned by appends, used by row_at / rows_after)
+is its byte offset in the CSV store and its rowid in SQLite. In both
+it grows with every append, but starts over when the table is
+rewritten (replace_rows): a position kept across a rewrite may point
+at another row or be passed by new ones, so holders must detect
+rewrites themselves (see core.status_log).
+
+append_batch() writes rows to several tables as one all-or-nothing
+unit (used by core.group_commit). Every write holds write_lock(), which
+callers can also take to read and rewrite a table atomically.
+"""
+
+import csv
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+from core import csv_index, sqlite_store
+from core.config import STORAGE_BACKEND
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; the thread lock still applies
+    fcntl = None
+
+# =============================
+# FILE PATHS
+# =============================
+CUSTOMER_FILE = "data/customers.csv"
+OFFICER_FILE = "data/loan_officers.csv"
+APP_FILE = "data/applications.csv"
+NOTIFY_FILE = "data/notifications.csv"
+VISIT_FILE = "data/branch_visits.csv"
+AUDIT_FILE = "data/audit_logs.csv"
+
+# Sizes of the CSVs a batch is writing to, while it is in flight; its
+# flock is also the store's write lock (write_lock())
+BATCH_JOURNAL = "data/batch_journal.json"
+
+CUSTOMER_HEADER = [
+    "Customer_ID", "Full_Name", "DOB", "Gender",
+    "Mobile", "Email", "Address",
+    "PAN", "Aadhaar", "PIN"
+]
+CUSTOMER_UNIQUE_FIELDS = ("Mobile", "PAN", "Aadhaar")
+
+OFFICER_HEADER = ["Officer_ID", "Name", "EmpCode", "PIN"]
+
+APP_HEADER = [
+    "Application_ID", "Customer_ID", "Requested_Amount", "Tenure",
+    "Net_Weight", "Carat", "Status", "Document_Failure_Reason",
+    "Extracted_Name", "Extracted_DOB", "Extracted_ID_Last4", "Created_At"
+]
+
+NOTIFY_HEADER = [
+    "Customer_ID", "Application_ID", "Sender", "Message", "Created_At"
+]
+
+# branch_visits.csv and audit_logs.csv were written without a header
+# row; these are their column names
+VISIT_HEADER = [
+    "Application_ID", "Branch", "Branch_Code", "Visit_Date", "Visit_Time",
+    "Status"
+]
+AUDIT_HEADER = ["Timestamp", "Officer", "Application_ID", "Action", "Details"]
+
+MASTER_TABLES = {
+    CUSTOMER_FILE: CUSTOMER_HEADER,
+    OFFICER_FILE: OFFICER_HEADER,
+    APP_FILE: APP_HEADER,
+    NOTIFY_FILE: NOTIFY_HEADER,
+    VISIT_FILE: VISIT_HEADER,
+    AUDIT_FILE: AUDIT_HEADER
+}
+
+_CACHE = {}
+_LOCK = threading.Lock()
+_WRITE_LOCK = threading.RLock()
+_WRITER = {"depth": 0, "journal": None}
+_BACKEND = {"name": STORAGE_BACKEND}
+
+
+def set_backend(name, sqlite_file=None):
+    """
+    Switches the store ("csv" or "sqlite") for this process.
+    """
+    if name not in ("csv", "sqlite"):
+        raise ValueError(f"Unknown storage backend: {name}")
+    _BACKEND["name"] = name
+    if sqlite_file:
+        sqlite_store.use_database(sqlite_file)
+
+
+def backend():
+    """
+    Name of the active store: "csv" or "sqlite".
+    """
+    return _BACKEND["name"]
+
+
+def _sqlite():
+    return _BACKEND["name"] == "sqlite"
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+# =============================
+# READS
+# =============================
+def read_table(path):
+    """
+    Returns (header, rows) for a CSV file with a header row.
+    Rows are shared with other callers: treat them as read-only.
+    """
+    if _sqlite():
+        return sqlite_store.read_table(path)
+
+    if not os.path.exists(path):
+        return [], []
+
+    with _LOCK:
+        stamp = _stamp(path)
+        entry = _CACHE.get(path)
+        if entry is None or entry["stamp"] != stamp:
+            with open(path, newline="", encoding="utf-8") as f:
+                reader = csv.DictReader(f)
+                rows = list(reader)
+                header = reader.fieldnames or []
+            entry = {"stamp": stamp, "header": header, "rows": rows}
+            _CACHE[path] = entry
+        return entry["header"], entry["rows"]
+
+
+def read_rows(path):
+    return read_table(path)[1]
+
+
+def find_rows(path, field, value):
+    if _sqlite():
+        return sqlite_store.find_rows(path, field, value)
+    return csv_index.lookup(path, field, value)
+
+
+def find_one(path, field, value):
+    rows = find_rows(path, field, value)
+    return rows[0] if rows else None
+
+
+def positions(path, field, value):
+    """
+    Positions of the rows whose `field` equals `value`, without
+    reading the rows.
+    """
+    if _sqlite():
+        return sqlite_store.positions(path, field, value)
+    return csv_index.offsets(path, field, value)
+
+
+def row_at(path, position):
+    """
+    The row at a position returned by an append, or None.
+    """
+    if _sqlite():
+        return sqlite_store.row_at(path, position)
+    if not os.path.exists(path):
+        return None
+    return csv_index.read_row_at(path, position)
+
+
+def rows_after(path, position=-1):
+    """
+    Yields (position, row) for every row past `position`, in order.
+    """
+    if _sqlite():
+        yield from sqlite_store.rows_after(path, position)
+        return
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        header, header_end = csv_index.read_header(f)
+        for offset, _, row in csv_index.iter_records(f, max(header_end, position)):
+            if offset > position:
+                yield offset, dict(zip(header, row))
+
+
+def end_position(path):
+    """
+    Upper bound of the positions in use; drops when a table is
+    truncated or rewritten smaller.
+    """
+    if _sqlite():
+        return sqlite_store.end_position(path)
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+# =============================
+# WRITES
+# =============================
+@contextmanager
+def write_lock():
+    """
+    Exclusive write access to the store, across threads and processes;
+    reentrant. Every write below takes it, so a read-then-rewrite done
+    inside it (status_log.compact) cannot lose a concurrent append.
+    CSV: a thread lock plus an flock on BATCH_JOURNAL. SQLite: one
+    IMMEDIATE transaction (writes inside it run as savepoints).
+
+    CSV: a batch left in the journal by a writer that died is rolled
+    back on taking the lock, before anything else is written.
+    """
+    if _sqlite():
+        with sqlite_store.transaction("IMMEDIATE", fsync=True):
+            yield
+        return
+
+    with _WRITE_LOCK:
+        if _WRITER["depth"] == 0:
+            journal = open(BATCH_JOURNAL, "a+", encoding="utf-8")
+            try:
+                if fcntl:
+                    fcntl.flock(journal, fcntl.LOCK_EX)
+                _roll_back(journal)
+            except BaseException:
+                journal.close()
+                raise
+            _WRITER["journal"] = journal
+        _WRITER["depth"] += 1
+        try:
+            yield
+        finally:
+            _WRITER["depth"] -= 1
+            if _WRITER["depth"] == 0:
+                _WRITER["journal"].close()
+                _WRITER["journal"] = None
+
+
+def _cache_is_fresh(path):
+    entry = _CACHE.get(path)
+    return (
+        entry is not None
+        and os.path.exists(path)
+        and entry["stamp"] == _stamp(path)
+    )
+
+
+def _extend_cache(path, fresh, rows):
+    if fresh:
+        entry = _CACHE[path]
+        entry["rows"].extend(
+            dict(zip(entry["header"], (str(v) for v in row)))
+            for row in rows
+        )
+        entry["stamp"] = _stamp(path)
+    else:
+        _CACHE.pop(path, None)
+
+
+def append_rows(path, rows, fsync=False):
+    """
+    Appends rows (lists in header order) in one write.
+    Returns the position of each row.
+    """
+    if _sqlite():
+        return sqlite_store.append_rows(path, rows, fsync=fsync)
+
+    with write_lock(), _LOCK:
+        fresh = _cache_is_fresh(path)
+        offsets = csv_index.append_rows(path, rows, fsync=fsync)
+        _extend_cache(path, fresh, rows)
+
+    return offsets
+
+
+def append_unique_rows(path, rows, unique_fields, fsync=False):
+    """
+    Appends only the rows that do not repeat a `unique_fields` value
+    already in the file (checked and written atomically, see
+    csv_index.append_unique_rows). Returns (offset, None) per written
+    row and (None, clashing field) per rejected one.
+    """
+    if _sqlite():
+        return sqlite_store.append_unique_rows(
+            path, rows, unique_fields, fsync=fsync
+        )
+
+    with write_lock(), _LOCK:
+        fresh = _cache_is_fresh(path)
+        results = csv_index.append_unique_rows(
+            path, rows, unique_fields, fsync=fsync
+        )
+        _extend_cache(
+            path, fresh,
+            [row for row, (offset, _) in zip(rows, results) if offset is not None]
+        )
+
+    return results
+
+
+def append_unique_row(path, row, unique_fields):
+    return append_unique_rows(path, [row], unique_fields)[0]
+
+
+def append_row(path, row):
+    """
+    Appends one row (list in header order). Returns its position.
+    """
+    return append_rows(path, [row])[0]
+
+
+# =============================
+# MULTI-TABLE BATCHES
+# =============================
+def _sync_journal(journal, sizes):
+    journal.seek(0)
+    journal.truncate()
+    if sizes:
+        json.dump(sizes, journal)
+    journal.flush()
+    os.fsync(journal.fileno())
+
+
+def _roll_back(journal):
+    """
+    Cuts every file named in the journal back to its recorded size:
+    undoes a batch that failed or whose writer died mid-way.
+    """
+    journal.seek(0)
+    text = journal.read()
+    if not text:
+        return
+    try:
+        sizes = json.loads(text)
+    except ValueError:
+        sizes = {}   # died while writing the journal: nothing was appended
+
+    for path, size in sizes.items():
+        if os.path.exists(path) and os.path.getsize(path) > size:
+            with _LOCK:
+                os.truncate(path, size)
+                _CACHE.pop(path, None)
+            csv_index.drop_indexes(path)
+    _sync_journal(journal, None)
+
+
+def append_batch(writes, fsync=True):
+    """
+    Appends `writes` ([(path, row)], rows in header order) to their
+    tables as one unit: after a crash or error either every row is
+    there or none is. Returns the position of each row, in order.
+
+    SQLite: one transaction. CSV: the size of each touched file is
+    fsync'd to BATCH_JOURNAL first and cleared once all files are
+    written. The batch holds write_lock() throughout, so no other
+    writer can append to those files mid-batch; if this process dies,
+    the next write_lock() in any process (recover_batches() at
+    startup) cuts the files back before writing anything else.
+    """
+    if _sqlite():
+        return sqlite_store.append_batch(writes, fsync=fsync)
+
+    by_path = {}
+    for i, (path, row) in enumerate(writes):
+        by_path.setdefault(path, []).append((i, row))
+
+    result = [None] * len(writes)
+    with write_lock():
+        journal = _WRITER["journal"]
+        _sync_journal(journal, {path: end_position(path) for path in by_path})
+        try:
+            for path, items in by_path.items():
+                offsets = append_rows(path, [row for _, row in items], fsync=fsync)
+                for (i, _), offset in zip(items, offsets):
+                    result[i] = offset
+        except BaseException:
+            _roll_back(journal)
+            raise
+        _sync_journal(journal, None)
+
+    return result
+
+
+def recover_batches():
+    """
+    Rolls back a batch whose writer died mid-way (see append_batch).
+    Called once at startup, before any write.
+    """
+    if not _sqlite():
+        with write_lock():
+            pass
+
+
+# =============================
+# TABLES
+# =============================
+def ensure_table(path, header):
+    """
+    Creates an empty table (CSV: file with a header row) if missing.
+    Returns True when it was created.
+    """
+    if _sqlite():
+        return sqlite_store.ensure_table(path, header)
+    if os.path.exists(path):
+        return False
+    with write_lock():
+        if os.path.exists(path):
+            return False
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow(header)
+    return True
+
+
+def replace_rows(path, header, rows):
+    """
+    Replaces the table contents with `rows` (lists in header order).
+    CSV: written to a temp file, fsync'd and renamed over the old one,
+    so a crash leaves either the old or the new table.
+    """
+    if _sqlite():
+        return sqlite_store.replace_rows(path, header, rows)
+
+    with write_lock():
+        tmp = path + ".tmp"
+        with open(tmp, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        with _LOCK:
+            _CACHE.pop(path, None)
+        csv_index.drop_indexes(path)
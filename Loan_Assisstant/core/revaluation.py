@@ -0,0 +1,155 @@
+"""
+Portfolio revaluation for gold-rate moves.
+
+The active book (applications not REJECTED) is loaded once into
+columnar NumPy arrays. For a gold rate R:
+
+    collateral = Net_Weight * R * PURITY_FACTOR[Carat]
+    LTV        = Requested_Amount / collateral
+
+A loan breaches when LTV > MAX_LTV, i.e. when R drops below its
+breach rate  Requested_Amount / (Net_Weight * purity * MAX_LTV).
+Breach rates are sorted once, so the breached set for any rate is a
+binary search, and a small tick only touches the loans whose breach
+rate lies between the old and new rate (breach_delta).
+"""
+
+from core.config import GOLD_RATE_PER_GRAM, MAX_LTV, PURITY_FACTOR
+from core.repository import APP_FILE, read_rows
+from core.status_log import current_statuses
+
+INACTIVE_STATUSES = ("REJECTED",)
+
+
+def _purity_table(np):
+    table = np.zeros(max(PURITY_FACTOR) + 1)
+    for carat, factor in PURITY_FACTOR.items():
+        table[carat] = factor
+    return table
+
+
+def build_book(ids, net_weight, carat, requested):
+    """
+    Columnar book from parallel sequences. Loans without a usable
+    weight or a known carat are dropped.
+    """
+    import numpy as np
+
+    ids = np.asarray(ids, dtype=object)
+    weight = np.asarray(net_weight, dtype=np.float64)
+    carat = np.asarray(carat, dtype=np.int64)
+    requested = np.asarray(requested, dtype=np.float64)
+
+    purity_table = _purity_table(np)
+    known = (carat >= 0) & (carat < len(purity_table))
+    lookup = np.clip(carat, 0, len(purity_table) - 1)
+    purity = np.where(known, purity_table[lookup], 0.0)
+
+    keep = (weight > 0) & (purity > 0)
+    ids, weight, carat, requested, purity = (
+        ids[keep], weight[keep], carat[keep], requested[keep], purity[keep]
+    )
+
+    breach_rate = requested / (weight * purity * MAX_LTV)
+    order = np.argsort(breach_rate, kind="stable")
+
+    return {
+        "ids": ids,
+        "net_weight": weight,
+        "carat": carat,
+        "requested": requested,
+        "purity": purity,
+        "breach_rate": breach_rate,
+        "order": order,
+        "sorted_breach_rate": breach_rate[order]
+    }
+
+
+def load_book():
+    """
+    Active applications from applications.csv (current statuses applied).
+    """
+    statuses = current_statuses()
+    ids, weight, carat, requested = [], [], [], []
+
+    for r in read_rows(APP_FILE):
+        status = statuses.get(r["Application_ID"], r["Status"])
+        if status in INACTIVE_STATUSES:
+            continue
+        try:
+            w = float(r["Net_Weight"])
+            c = int(float(r["Carat"]))
+            a = float(r["Requested_Amount"])
+        except (TypeError, ValueError):
+            continue
+        ids.append(r["Application_ID"])
+        weight.append(w)
+        carat.append(c)
+        requested.append(a)
+
+    return build_book(ids, weight, carat, requested)
+
+
+# =============================
+# REVALUATION
+# =============================
+def revalue(book, gold_rate=GOLD_RATE_PER_GRAM):
+    """
+    Full vectorized pass. Returns dict of arrays:
+    collateral, ltv, breached (bool mask).
+    """
+    collateral = book["net_weight"] * gold_rate * book["purity"]
+    return {
+        "collateral": collateral,
+        "ltv": book["requested"] / collateral,
+        # same test as breaches_at, so both agree at the boundary
+        "breached": book["breach_rate"] > gold_rate
+    }
+
+
+def breaches_at(book, gold_rate):
+    """
+    Indices of loans above MAX_LTV at `gold_rate` (binary search over
+    the sorted breach rates; cost grows with the result size only).
+    """
+    import numpy as np
+
+    start = np.searchsorted(book["sorted_breach_rate"], gold_rate, side="right")
+    return book["order"][start:]
+
+
+def breach_delta(book, old_rate, new_rate):
+    """
+    Incremental re-run for a rate tick. Returns (newly_breached, cured)
+    index arrays: only loans whose breach rate lies between the two
+    rates can change state.
+    """
+    import numpy as np
+
+    lo, hi = sorted((old_rate, new_rate))
+    sorted_rates = book["sorted_breach_rate"]
+    i = np.searchsorted(sorted_rates, lo, side="right")
+    j = np.searchsorted(sorted_rates, hi, side="right")
+    changed = book["order"][i:j]
+
+    empty = changed[:0]
+    if new_rate < old_rate:
+        return changed, empty
+    return empty, changed
+
+
+def breach_report(book, indices, gold_rate):
+    """
+    Rows for the officer / export: one dict per breached loan.
+    """
+    result = []
+    for i in indices:
+        collateral = book["net_weight"][i] * gold_rate * book["purity"][i]
+        result.append({
+            "Application_ID": book["ids"][i],
+            "Requested_Amount": round(float(book["requested"][i]), 2),
+            "Collateral_Value": round(float(collateral), 2),
+            "LTV": round(float(book["requested"][i] / collateral), 4),
+            "Breach_Rate": round(float(book["breach_rate"][i]), 2)
+        })
+    return result
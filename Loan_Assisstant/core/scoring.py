@@ -0,0 +1,153 @@
+"""
+Application scoring stage.
+
+Identity match (name / DOB / Aadhaar last-4), the LOW/MEDIUM/HIGH risk
+decision and the explanation-only agents run once per application:
+at submission, when a background KYC result lands, or in a batch over
+the pending queue (score_pending). Results are appended to
+data/app_scores.csv (latest row per application wins), so the officer
+dashboard reads, sorts and filters them without recomputing.
+"""
+
+from datetime import datetime
+
+from core.repository import (
+    CUSTOMER_FILE,
+    append_row,
+    ensure_table,
+    find_one,
+    find_rows
+)
+
+SCORE_FILE = "data/app_scores.csv"
+SCORE_HEADER = [
+    "Application_ID", "Fields_OK", "Name_Match", "DOB_Match", "ID_Match",
+    "Risk", "Risk_Reason", "Exposure_Risk", "Exposure_Reason",
+    "Policy_Score", "Missing_Fields", "Scored_At"
+]
+
+RISK_ORDER = {"HIGH": 0, "MEDIUM": 1, "LOW": 2}
+
+
+# =============================
+# SAFE AGENTS (EXPLANATION ONLY)
+# =============================
+def document_validation_agent(app):
+    required = ["Requested_Amount", "Net_Weight", "Carat"]
+    return [f for f in required if not app.get(f)]
+
+
+def policy_compliance_agent(app):
+    return 0.82, (
+        "The requested loan amount falls within permissible "
+        "Loan-to-Value thresholds for the given gold purity."
+    )
+
+
+def risk_evaluation_agent(app):
+    amount = float(app["Requested_Amount"])
+    if amount > 500000:
+        return "HIGH", "Requested amount exceeds retail gold loan limits."
+    elif amount > 200000:
+        return "MEDIUM", "Moderate exposure based on loan amount."
+    return "LOW", "Low exposure based on conservative loan amount."
+
+
+# =============================
+# SCORING
+# =============================
+def score_application(app, customer):
+    """
+    Rule-based identity match and risk for one application.
+    Returns a dict keyed by SCORE_HEADER (booleans as "1"/"0").
+    """
+    ex_name = app.get("Extracted_Name")
+    ex_dob = app.get("Extracted_DOB")
+    ex_id = app.get("Extracted_ID_Last4")
+
+    cust_name = customer["Full_Name"]
+    cust_dob = customer["DOB"]
+    cust_id_last4 = customer["Aadhaar"][-4:]
+
+    fields_ok = bool(ex_name and ex_dob and ex_id)
+    name_match = bool(ex_name and ex_name.lower() in cust_name.lower())
+    dob_match = bool(ex_dob and ex_dob in cust_dob)
+    id_match = bool(ex_id and ex_id == cust_id_last4)
+
+    if name_match and dob_match and id_match:
+        risk = "LOW"
+        risk_msg = "All identity fields match customer records."
+    elif name_match and id_match:
+        risk = "MEDIUM"
+        risk_msg = "Name and ID match, but DOB mismatch or missing."
+    else:
+        risk = "HIGH"
+        risk_msg = "Identity mismatch or insufficient document verification."
+
+    try:
+        exposure, exposure_msg = risk_evaluation_agent(app)
+    except (KeyError, ValueError):
+        exposure, exposure_msg = "", "Requested amount unreadable."
+    policy_score, _ = policy_compliance_agent(app)
+
+    return {
+        "Application_ID": app["Application_ID"],
+        "Fields_OK": "1" if fields_ok else "0",
+        "Name_Match": "1" if name_match else "0",
+        "DOB_Match": "1" if dob_match else "0",
+        "ID_Match": "1" if id_match else "0",
+        "Risk": risk,
+        "Risk_Reason": risk_msg,
+        "Exposure_Risk": exposure,
+        "Exposure_Reason": exposure_msg,
+        "Policy_Score": str(policy_score),
+        "Missing_Fields": ";".join(document_validation_agent(app)),
+        "Scored_At": datetime.now().isoformat()
+    }
+
+
+def save_score(score):
+    ensure_table(SCORE_FILE, SCORE_HEADER)
+    append_row(SCORE_FILE, [score[k] for k in SCORE_HEADER])
+    return score
+
+
+def score_and_save(app, customer=None):
+    """
+    Scores and persists one application. Looks the customer up by id
+    (index lookup) when not supplied. Returns the score or None.
+    """
+    if customer is None:
+        customer = find_one(CUSTOMER_FILE, "Customer_ID", app["Customer_ID"])
+    if customer is None:
+        return None
+    return save_score(score_application(app, customer))
+
+
+def stored_score(application_id):
+    scores = find_rows(SCORE_FILE, "Application_ID", application_id)
+    return scores[-1] if scores else None
+
+
+def application_score(app):
+    """
+    Persisted score, computing it once for applications submitted
+    before scoring existed.
+    """
+    return stored_score(app["Application_ID"]) or score_and_save(app)
+
+
+def score_pending(applications):
+    """
+    Batch stage over the queue: scores every application that has no
+    stored score yet. Returns the number scored.
+    """
+    scored = 0
+    for app in applications:
+        if stored_score(app["Application_ID"]) is None:
+            scored += score_and_save(app) is not None
+    return scored
+
+
+def risk_sort_key(score):
+    return RISK_ORDER.get(score["Risk"] if score else "", len(RISK_ORDER))
@@ -0,0 +1,295 @@
+"""
+SQLite storage backend (WAL mode) behind core.repository.
+
+Each CSV under data/ maps to a table named after the file
+("data/customers.csv" -> customers) with the same columns, all TEXT,
+so rows read back exactly as the CSV backend returns them. A row's
+position is its rowid, which like a CSV byte offset grows with every
+append and starts over after replace_rows() (no AUTOINCREMENT).
+
+- connections : one per thread, WAL journal (readers never block the
+                writer), busy timeout for writers in other processes
+- indexes     : one per looked-up column, created on first lookup
+                (the columns csv_index would index for the CSV store)
+- writes      : one transaction per call (append_batch: one for rows
+                of several tables; calls nested in transaction() run
+                as savepoints); fsync=True commits with
+                synchronous=FULL. Unique appends take the write lock
+                (BEGIN IMMEDIATE) before checking, so the check and
+                the insert are atomic across processes.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from core.config import SQLITE_FILE
+
+_STATE = {"path": SQLITE_FILE}
+_LOCAL = threading.local()
+_INDEXED = set()
+_COLUMNS = {}
+
+
+def use_database(path):
+    _STATE["path"] = path
+
+
+def table_name(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+# =============================
+# CONNECTION
+# =============================
+def connect():
+    connections = _LOCAL.__dict__.setdefault("connections", {})
+    conn = connections.get(_STATE["path"])
+    if conn is None:
+        conn = sqlite3.connect(_STATE["path"], timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        connections[_STATE["path"]] = conn
+    return conn
+
+
+@contextmanager
+def _transaction(conn, mode="", fsync=False):
+    if conn.in_transaction:
+        # inside an outer transaction (repository.write_lock): a savepoint
+        conn.execute("SAVEPOINT nested")
+        try:
+            yield
+            conn.execute("RELEASE nested")
+        except BaseException:
+            conn.execute("ROLLBACK TO nested")
+            conn.execute("RELEASE nested")
+            raise
+        return
+
+    if fsync:
+        conn.execute("PRAGMA synchronous=FULL")
+    conn.execute(f"BEGIN {mode}")
+    try:
+        yield
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        if fsync:
+            conn.execute("PRAGMA synchronous=NORMAL")
+
+
+def transaction(mode="", fsync=False):
+    """
+    A transaction on this thread's connection; writes made inside it
+    join it.
+    """
+    return _transaction(connect(), mode, fsync)
+
+
+# =============================
+# SCHEMA
+# =============================
+def columns(path):
+    """
+    Column names of the table ([] if it does not exist yet).
+    Cached once the table exists: columns never change afterwards.
+    """
+    key = (_STATE["path"], table_name(path))
+    cached = _COLUMNS.get(key)
+    if cached:
+        return cached
+    rows = connect().execute(
+        f"PRAGMA table_info({_quote(table_name(path))})"
+    ).fetchall()
+    _COLUMNS[key] = [r[1] for r in rows]
+    return _COLUMNS[key]
+
+
+def ensure_table(path, header):
+    """
+    Creates the table if missing. Returns True when it was created.
+    """
+    if columns(path):
+        return False
+    cols = ", ".join(f"{_quote(c)} TEXT" for c in header)
+    connect().execute(
+        f"CREATE TABLE IF NOT EXISTS {_quote(table_name(path))} ({cols})"
+    )
+    return True
+
+
+def ensure_index(path, field):
+    key = (_STATE["path"], table_name(path), field)
+    if key in _INDEXED:
+        return
+    table = table_name(path)
+    connect().execute(
+        f"CREATE INDEX IF NOT EXISTS {_quote(f'ix_{table}_{field}'.lower())} "
+        f"ON {_quote(table)} ({_quote(field)})"
+    )
+    _INDEXED.add(key)
+
+
+def _insert_sql(path, header, width):
+    cols = ", ".join(_quote(c) for c in header[:width])
+    marks = ", ".join("?" * width)
+    return f"INSERT INTO {_quote(table_name(path))} ({cols}) VALUES ({marks})"
+
+
+def _values(row):
+    return ["" if v is None else str(v) for v in row]
+
+
+# =============================
+# READS
+# =============================
+def read_table(path):
+    header = columns(path)
+    if not header:
+        return [], []
+    cursor = connect().execute(
+        f"SELECT * FROM {_quote(table_name(path))} ORDER BY rowid"
+    )
+    return header, [dict(zip(header, r)) for r in cursor]
+
+
+def positions(path, field, value):
+    if field not in columns(path):
+        return []
+    ensure_index(path, field)
+    cursor = connect().execute(
+        f"SELECT rowid FROM {_quote(table_name(path))} "
+        f"WHERE {_quote(field)} = ? ORDER BY rowid",
+        (value,)
+    )
+    return [r[0] for r in cursor]
+
+
+def find_rows(path, field, value):
+    header = columns(path)
+    if field not in header:
+        return []
+    ensure_index(path, field)
+    cursor = connect().execute(
+        f"SELECT * FROM {_quote(table_name(path))} "
+        f"WHERE {_quote(field)} = ? ORDER BY rowid",
+        (value,)
+    )
+    return [dict(zip(header, r)) for r in cursor]
+
+
+def row_at(path, position):
+    header = columns(path)
+    if not header:
+        return None
+    row = connect().execute(
+        f"SELECT * FROM {_quote(table_name(path))} WHERE rowid = ?",
+        (position,)
+    ).fetchone()
+    return dict(zip(header, row)) if row else None
+
+
+def rows_after(path, position):
+    header = columns(path)
+    if not header:
+        return
+    cursor = connect().execute(
+        f"SELECT rowid, * FROM {_quote(table_name(path))} "
+        f"WHERE rowid > ? ORDER BY rowid",
+        (position,)
+    )
+    for r in cursor:
+        yield r[0], dict(zip(header, r[1:]))
+
+
+def end_position(path):
+    if not columns(path):
+        return 0
+    row = connect().execute(
+        f"SELECT MAX(rowid) FROM {_quote(table_name(path))}"
+    ).fetchone()
+    return row[0] or 0
+
+
+# =============================
+# WRITES
+# =============================
+def _insert(conn, path, header, rows):
+    result = []
+    for row in rows:
+        cursor = conn.execute(_insert_sql(path, header, len(row)), _values(row))
+        result.append(cursor.lastrowid)
+    return result
+
+
+def append_rows(path, rows, fsync=False):
+    header = columns(path)
+    conn = connect()
+    with _transaction(conn, fsync=fsync):
+        return _insert(conn, path, header, rows)
+
+
+def append_batch(writes, fsync=False):
+    """
+    Inserts [(path, row)] into their tables in one transaction.
+    """
+    conn = connect()
+    result = []
+    with _transaction(conn, "IMMEDIATE", fsync=fsync):
+        for path, row in writes:
+            result.extend(_insert(conn, path, columns(path), [row]))
+    return result
+
+
+def append_unique_rows(path, rows, unique_fields, fsync=False):
+    header = columns(path)
+    cols = [(field, header.index(field)) for field in unique_fields]
+    for field in unique_fields:
+        ensure_index(path, field)
+
+    conn = connect()
+    table = _quote(table_name(path))
+    results, seen = [], set()
+
+    with _transaction(conn, "IMMEDIATE", fsync=fsync):
+        for row in rows:
+            clash = None
+            for field, col in cols:
+                value = str(row[col])
+                if (field, value) in seen or conn.execute(
+                    f"SELECT 1 FROM {table} WHERE {_quote(field)} = ? LIMIT 1",
+                    (value,)
+                ).fetchone():
+                    clash = field
+                    break
+            if clash:
+                results.append((None, clash))
+                continue
+            seen.update((field, str(row[col])) for field, col in cols)
+            results.append((_insert(conn, path, header, [row])[0], None))
+
+    return results
+
+
+def replace_rows(path, header, rows):
+    """
+    Replaces the whole table contents in one transaction.
+    """
+    ensure_table(path, header)
+    header = columns(path)
+    width = len(header)
+    conn = connect()
+    with _transaction(conn, "IMMEDIATE", fsync=True):
+        conn.execute(f"DELETE FROM {_quote(table_name(path))}")
+        conn.executemany(
+            _insert_sql(path, header, width),
+            (_values(row) + [None] * (width - len(row)) for row in rows)
+        )
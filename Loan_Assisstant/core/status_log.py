@@ -0,0 +1,164 @@
+"""
+Append-only application status log.
+
+Every status change is one appended row instead of a rewrite of
+applications.csv. The current status of an application is the last
+event recorded for it, folded on read over the status column of the
+applications file. compact() periodically folds the log back into the
+applications file and truncates it, leaving one marker row (no
+Application_ID, Actor COMPACTION_ACTOR) that starts the new log.
+
+Positions start over when the log is truncated, so a reader tells a
+compaction (by any process) by the log's first row changing, not by
+the positions.
+"""
+
+import threading
+from datetime import datetime
+
+from core.repository import (
+    APP_FILE,
+    append_row,
+    ensure_table,
+    read_table,
+    replace_rows,
+    rows_after,
+    write_lock
+)
+
+STATUS_LOG_FILE = "data/status_events.csv"
+STATUS_LOG_HEADER = [
+    "Application_ID", "Old_Status", "New_Status", "Actor", "Changed_At"
+]
+
+# Fold the log back into applications.csv once it holds this many events
+COMPACT_THRESHOLD = 500
+COMPACTION_ACTOR = "COMPACTION"
+
+_LOCK = threading.Lock()
+_FOLD = {"first": None, "position": -1, "events": 0, "statuses": {}}
+
+
+# =============================
+# WRITE
+# =============================
+def status_event(application_id, old_status, new_status, actor):
+    """
+    The (path, row) of a status transition, for writing together with
+    other rows through core.group_commit.
+    """
+    ensure_table(STATUS_LOG_FILE, STATUS_LOG_HEADER)
+    return STATUS_LOG_FILE, [
+        application_id,
+        old_status,
+        new_status,
+        actor,
+        datetime.now().isoformat()
+    ]
+
+
+def append_events(write):
+    """
+    Runs write() -- an append that may include status events -- so it
+    cannot interleave with compact(), then compacts if due.
+    """
+    with _LOCK:
+        result = write()
+        _fold_tail()
+        due = _FOLD["events"] >= COMPACT_THRESHOLD
+
+    if due:
+        compact()
+    return result
+
+
+def record_status_change(application_id, old_status, new_status, actor):
+    """
+    Appends a single status transition (constant-size write).
+    """
+    path, row = status_event(application_id, old_status, new_status, actor)
+    append_events(lambda: append_row(path, row))
+
+
+# =============================
+# READ (FOLD)
+# =============================
+def _first_row():
+    rows = rows_after(STATUS_LOG_FILE)
+    first = next(rows, None)
+    rows.close()
+    return first
+
+
+def _fold_tail():
+    """
+    Folds events appended since the last read into _FOLD.
+    Starts over if the log was compacted meanwhile (its first row is
+    no longer the one the fold started from).
+    """
+    first = _first_row()
+    if first != _FOLD["first"]:
+        _FOLD.update(first=first, position=-1, events=0, statuses={})
+
+    for position, event in rows_after(STATUS_LOG_FILE, _FOLD["position"]):
+        _FOLD["position"] = position
+        if not event["Application_ID"]:
+            continue   # compaction marker
+        _FOLD["statuses"][event["Application_ID"]] = event["New_Status"]
+        _FOLD["events"] += 1
+
+
+def current_statuses():
+    """
+    Returns {Application_ID: status} for applications changed since the
+    last compaction.
+    """
+    with _LOCK:
+        _fold_tail()
+        return dict(_FOLD["statuses"])
+
+
+def apply_current_status(rows):
+    """
+    Overlays the folded status onto application rows read from
+    applications.csv (in place) and returns them.
+    """
+    statuses = current_statuses()
+    for r in rows:
+        if r.get("Application_ID") in statuses:
+            r["Status"] = statuses[r["Application_ID"]]
+    return rows
+
+
+# =============================
+# COMPACTION
+# =============================
+def compact():
+    """
+    Writes folded statuses into applications.csv and truncates the log.
+    Holds the store's write lock from the fold to the truncation, so an
+    application or event appended meanwhile (by any process) waits
+    instead of being lost with the old files. replace_rows() leaves
+    either the old or the new table on a crash; replaying the log over
+    either is harmless.
+    """
+    with _LOCK, write_lock():
+        _fold_tail()
+        statuses = _FOLD["statuses"]
+        if not statuses:
+            return
+
+        fieldnames, cached = read_table(APP_FILE)
+        if not fieldnames:
+            return
+
+        rows = []
+        for r in cached:
+            status = statuses.get(r["Application_ID"], r["Status"])
+            rows.append([status if f == "Status" else r[f] for f in fieldnames])
+
+        replace_rows(APP_FILE, fieldnames, rows)
+        replace_rows(STATUS_LOG_FILE, STATUS_LOG_HEADER, [
+            ["", "", "", COMPACTION_ACTOR, datetime.now().isoformat()]
+        ])
+        _FOLD.update(first=None, position=-1, events=0, statuses={})
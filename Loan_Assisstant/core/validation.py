@@ -1,10 +1,81 @@
 import re
-def valid_name(name): return bool(re.fullmatch(r"[A-Za-z ]+", name))
-def valid_mobile(mobile): return bool(re.fullmatch(r"[6-9]\d{9}", mobile))
-def valid_email(email): return bool(re.fullmatch(r"[^@]+@[^@]+\.[^@]+", email))
-def valid_pan(pan): return bool(re.fullmatch(r"[A-Z]{5}[0-9]{4}[A-Z]", pan))
-def valid_aadhaar(aadhaar): return bool(re.fullmatch(r"\d{12}", aadhaar))
-def valid_pin(pin): return bool(re.fullmatch(r"\d{4}", pin))
-
-def valid_pin(pin):
-    return pin.isdigit() and len(pin) == 4
+from itertools import compress
+
+# Patterns are compiled once at import
+NAME_RE = re.compile(r"[A-Za-z ]+")
+MOBILE_RE = re.compile(r"[6-9]\d{9}")
+EMAIL_RE = re.compile(r"[^@]+@[^@]+\.[^@]+")
+PAN_RE = re.compile(r"[A-Z]{5}[0-9]{4}[A-Z]")
+AADHAAR_RE = re.compile(r"\d{12}")
+PIN_RE = re.compile(r"\d{4}")
+
+def valid_name(name): return bool(NAME_RE.fullmatch(name))
+def valid_mobile(mobile): return bool(MOBILE_RE.fullmatch(mobile))
+def valid_email(email): return bool(EMAIL_RE.fullmatch(email))
+def valid_pan(pan): return bool(PAN_RE.fullmatch(pan))
+def valid_aadhaar(aadhaar): return bool(AADHAAR_RE.fullmatch(aadhaar))
+def valid_pin(pin): return bool(PIN_RE.fullmatch(pin))
+
+
+# =============================
+# BATCH VALIDATION
+# =============================
+# customers.csv column -> (pattern, error bit, message)
+FIELD_RULES = {
+    "Full_Name": (NAME_RE, 1, "Invalid Name"),
+    "Mobile": (MOBILE_RE, 2, "Invalid Mobile"),
+    "Email": (EMAIL_RE, 4, "Invalid Email"),
+    "PAN": (PAN_RE, 8, "Invalid PAN"),
+    "Aadhaar": (AADHAAR_RE, 16, "Invalid Aadhaar"),
+    "PIN": (PIN_RE, 32, "Invalid PIN"),
+}
+
+
+def record_errors(record):
+    """
+    Error bitmask for one record (dict keyed by customers.csv columns).
+    Bit values are in FIELD_RULES; 0 means valid.
+    """
+    mask = 0
+    for field, (pattern, bit, _) in FIELD_RULES.items():
+        if not pattern.fullmatch(record.get(field) or ""):
+            mask |= bit
+    return mask
+
+
+def error_messages(mask):
+    return [msg for _, bit, msg in FIELD_RULES.values() if mask & bit]
+
+
+def validate_records(records):
+    """
+    Row-oriented batch: one error bitmask per record.
+    """
+    return [record_errors(r) for r in records]
+
+
+def _pack(flags, count):
+    bitmap = bytearray((count + 7) // 8)
+    for i in compress(range(count), flags):
+        bitmap[i >> 3] |= 1 << (i & 7)
+    return bitmap
+
+
+def validate_columns(columns):
+    """
+    Columnar batch: {field: list of values} -> {field: bitmap}, where
+    bit i (byte i // 8, bit i % 8) is set when row i is invalid.
+    Fields not in FIELD_RULES are ignored; None counts as "".
+    """
+    bitmaps = {}
+    for field, values in columns.items():
+        if field not in FIELD_RULES:
+            continue
+        fullmatch = FIELD_RULES[field][0].fullmatch
+        flags = [fullmatch(v or "") is None for v in values]
+        bitmaps[field] = _pack(flags, len(values))
+    return bitmaps
+
+
+def is_invalid(bitmap, row):
+    return bool(bitmap[row >> 3] & (1 << (row & 7)))
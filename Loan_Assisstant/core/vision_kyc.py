@@ -1,37 +1,36 @@
 import base64
-from groq import Groq
-from PIL import Image
+import logging
+import os
 import io
+import threading
+from functools import lru_cache
+
+from core import kyc_cache
+from core.config import KYC_IMAGE_MAX_DIMENSION, KYC_IMAGE_JPEG_QUALITY
+
+logger = logging.getLogger(__name__)
+
+# Totals over every image normalized by this process (normalization_stats)
+_STATS_LOCK = threading.Lock()
+_STATS = {"images": 0, "original_bytes": 0, "sent_bytes": 0}
 
 # ----------------------------
 # GROQ CONFIG
 # ----------------------------
 GROQ_API_KEY = "Your key"  # <-- put your key here
-client = Groq(api_key=GROQ_API_KEY)
+# Point at a local stub server (tools/stub_vision_server.py) for offline runs
+GROQ_BASE_URL = os.environ.get("GROQ_BASE_URL")
 
 VISION_MODEL = "meta-llama/llama-4-maverick-17b-128e-instruct"
 
+# Bump whenever KYC_PROMPT changes so cached results are not reused
+PROMPT_VERSION = "v1"
 
-def is_image(file_bytes):
-    try:
-        Image.open(io.BytesIO(file_bytes))
-        return True
-    except:
-        return False
-
-
-def extract_identity_from_image(file_bytes):
-    """
-    Uses Groq Vision model to extract KYC fields from image.
-    Returns structured dict (SAFE for CSV).
-    """
-
-    if not is_image(file_bytes):
-        return None, "Uploaded file is not an image"
-
-    base64_image = base64.b64encode(file_bytes).decode("utf-8")
+# How images are normalized before the model sees them, also part of the
+# cache key; bump the version whenever normalize_image() changes
+NORMALIZATION = f"n1:{KYC_IMAGE_MAX_DIMENSION}:{KYC_IMAGE_JPEG_QUALITY}"
 
-    prompt = """
+KYC_PROMPT = """
     You are a professional KYC document analysis expert.
 
     Extract identity information from the document.
@@ -49,17 +48,126 @@ def extract_identity_from_image(file_bytes):
     - No explanations
     """
 
-    response = client.chat.completions.create(
+
+@lru_cache(maxsize=1)
+def get_client():
+    """
+    Builds the Groq client on first use and shares it process-wide.
+    groq is imported here so pages that never call the vision model
+    (login, officer dashboard) do not pay for it.
+    """
+    from groq import Groq
+
+    return Groq(api_key=GROQ_API_KEY, base_url=GROQ_BASE_URL)
+
+
+def load_image(file_bytes):
+    """
+    Decodes the upload once. Returns a PIL image, or None if the bytes
+    are not an image.
+    """
+    from PIL import Image
+
+    try:
+        image = Image.open(io.BytesIO(file_bytes))
+        image.load()
+        return image
+    except:
+        return None
+
+
+def is_image(file_bytes):
+    return load_image(file_bytes) is not None
+
+
+def normalize_image(image, original_bytes):
+    """
+    Prepares a decoded upload for the vision model:
+    - applies the EXIF orientation, then drops all metadata
+    - downscales so the longest side is at most KYC_IMAGE_MAX_DIMENSION
+    - re-encodes as JPEG at KYC_IMAGE_JPEG_QUALITY
+
+    Returns (bytes, mime_type, stats).
+    """
+    from PIL import ImageOps
+
+    image = ImageOps.exif_transpose(image)
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    image.thumbnail((KYC_IMAGE_MAX_DIMENSION, KYC_IMAGE_MAX_DIMENSION))
+
+    out = io.BytesIO()
+    image.save(out, format="JPEG", quality=KYC_IMAGE_JPEG_QUALITY, optimize=True)
+    data = out.getvalue()
+
+    stats = {
+        "original_bytes": original_bytes,
+        "sent_bytes": len(data),
+        "saved_bytes": original_bytes - len(data),
+        "size": image.size
+    }
+    return data, "image/jpeg", stats
+
+
+def _record(stats):
+    with _STATS_LOCK:
+        _STATS["images"] += 1
+        _STATS["original_bytes"] += stats["original_bytes"]
+        _STATS["sent_bytes"] += stats["sent_bytes"]
+
+
+def normalization_stats():
+    """
+    Images normalized by this process and their bytes before / after
+    (cache hits are not counted; they send nothing).
+    """
+    with _STATS_LOCK:
+        s = dict(_STATS)
+    s["saved_bytes"] = s["original_bytes"] - s["sent_bytes"]
+    return s
+
+
+def extract_identity_from_image(file_bytes, use_cache=True):
+    """
+    Uses Groq Vision model to extract KYC fields from image.
+    Returns structured dict (SAFE for CSV).
+    Results are cached by image content, model, prompt version and
+    normalization settings;
+    use_cache=False forces a fresh model call (result is still stored).
+    """
+
+    key = kyc_cache.cache_key(
+        file_bytes, VISION_MODEL, PROMPT_VERSION, NORMALIZATION
+    )
+    cached = kyc_cache.get(key) if use_cache else None
+    if cached is not None:
+        return cached, None
+
+    image = load_image(file_bytes)
+    if image is None:
+        return None, "Uploaded file is not an image"
+
+    payload, mime_type, stats = normalize_image(image, len(file_bytes))
+    _record(stats)
+    logger.info(
+        "KYC image normalized: %d -> %d bytes (saved %d), %dx%d",
+        stats["original_bytes"], stats["sent_bytes"], stats["saved_bytes"],
+        *stats["size"]
+    )
+
+    base64_image = base64.b64encode(payload).decode("utf-8")
+
+    response = get_client().chat.completions.create(
         model=VISION_MODEL,
         messages=[
             {
                 "role": "user",
                 "content": [
-                    {"type": "text", "text": prompt},
+                    {"type": "text", "text": KYC_PROMPT},
                     {
                         "type": "image_url",
                         "image_url": {
-                            "url": f"data:image/jpeg;base64,{base64_image}"
+                            "url": f"data:{mime_type};base64,{base64_image}"
                         },
                     },
                 ],
@@ -85,4 +193,5 @@ def extract_identity_from_image(file_bytes):
             aadhaar = line.split(":", 1)[1].strip().replace(" ", "")
             extracted["aadhaar_last4"] = aadhaar[-4:] if aadhaar.isdigit() else ""
 
+    kyc_cache.put(key, extracted)
     return extracted, None
@@ -11,15 +11,35 @@ Final approval is always done by Loan Officer.
 """
 
 import streamlit as st
-import csv
 import uuid
-import os
 from datetime import date, datetime
 
-from core.vision_kyc import extract_identity_from_image
-from core.config import GOLD_RATE_PER_GRAM, MAX_LTV, PURITY_FACTOR
+from core.kyc_jobs import (
+    submit_extraction,
+    job_status,
+    attach_when_done,
+    extraction_failure_reason
+)
+from core.gold_rate import current_rate, record_rate_snapshot
+from core.config import (
+    MAX_LTV,
+    PURITY_FACTOR,
+    GOLD_LOAN_INTEREST_RATE
+)
 from core.masking import mask_dob, mask_pan, mask_mobile
-from core.emi_agent import emi_calculation_agent
+from core.emi_agent import emi_grid, grid_lookup, emi_explanation
+from core.repository import (
+    CUSTOMER_FILE,
+    APP_FILE,
+    APP_HEADER,
+    CUSTOMER_UNIQUE_FIELDS,
+    find_rows,
+    append_row,
+    append_unique_row
+)
+from core.scoring import score_and_save
+from core.pending_queue import enqueue
+from core.inbox import inbox, unread_count, mark_seen
 from core.doc_verification import (
     ocr_tool,
     ner_entity_extraction,
@@ -28,8 +48,6 @@ from core.doc_verification import (
 
 from core.validation import *
 
-CUSTOMER_FILE = "data/customers.csv"
-
 def render_customer_flow():
 
     # ---------- LOGIN ----------
@@ -50,14 +68,14 @@ def render_customer_flow():
             pin = st.text_input("Create 4-digit PIN", type="password")
 
             if st.button("Register"):
-                errors = []
-
-                if not valid_name(name): errors.append("Invalid Name")
-                if not valid_mobile(mobile): errors.append("Invalid Mobile")
-                if not valid_email(email): errors.append("Invalid Email")
-                if not valid_pan(pan): errors.append("Invalid PAN")
-                if not valid_aadhaar(aadhaar): errors.append("Invalid Aadhaar")
-                if not valid_pin(pin): errors.append("Invalid PIN")
+                errors = error_messages(record_errors({
+                    "Full_Name": name,
+                    "Mobile": mobile,
+                    "Email": email,
+                    "PAN": pan,
+                    "Aadhaar": aadhaar,
+                    "PIN": pin
+                }))
 
                 if errors:
                     for e in errors:
@@ -65,35 +83,37 @@ def render_customer_flow():
                 else:
                     customer_id = str(uuid.uuid4())
 
-                    with open(CUSTOMER_FILE, "a", newline="", encoding="utf-8") as f:
-                        csv.writer(f).writerow([
-                            customer_id,
-                            name,
-                            dob.strftime("%Y-%m-%d"),
-                            gender,
-                            mobile,
-                            email,
-                            address,
-                            pan,
-                            aadhaar,
-                            pin
-                        ])
-
-                    # ✅ AUTO-LOGIN AFTER REGISTRATION
-                    st.session_state.logged_customer = {
-                        "Customer_ID": customer_id,
-                        "Full_Name": name,
-                        "DOB": dob.strftime("%Y-%m-%d"),
-                        "Gender": gender,
-                        "Mobile": mobile,
-                        "Email": email,
-                        "Address": address,
-                        "PAN": pan,
-                        "Aadhaar": aadhaar
-                    }
-
-                    st.session_state.page = "home"
-                    st.rerun()
+                    _, duplicate = append_unique_row(CUSTOMER_FILE, [
+                        customer_id,
+                        name,
+                        dob.strftime("%Y-%m-%d"),
+                        gender,
+                        mobile,
+                        email,
+                        address,
+                        pan,
+                        aadhaar,
+                        pin
+                    ], CUSTOMER_UNIQUE_FIELDS)
+
+                    if duplicate:
+                        st.error(f"{duplicate} is already registered")
+                    else:
+                        # ✅ AUTO-LOGIN AFTER REGISTRATION
+                        st.session_state.logged_customer = {
+                            "Customer_ID": customer_id,
+                            "Full_Name": name,
+                            "DOB": dob.strftime("%Y-%m-%d"),
+                            "Gender": gender,
+                            "Mobile": mobile,
+                            "Email": email,
+                            "Address": address,
+                            "PAN": pan,
+                            "Aadhaar": aadhaar
+                        }
+
+                        st.session_state.page = "home"
+                        st.rerun()
 
         else:
             st.subheader("🔐 Existing Customer Login")
@@ -101,12 +121,11 @@ def render_customer_flow():
             pin = st.text_input("Safety PIN", type="password")
 
             if st.button("Login"):
-                with open(CUSTOMER_FILE, encoding="utf-8") as f:
-                    for row in csv.DictReader(f):
-                        if row["Mobile"] == mobile and row["PIN"] == pin:
-                            st.session_state.logged_customer = row
-                            st.session_state.page = "home"
-                            st.rerun()
+                for row in find_rows(CUSTOMER_FILE, "Mobile", mobile):
+                    if row["PIN"] == pin:
+                        st.session_state.logged_customer = row
+                        st.session_state.page = "home"
+                        st.rerun()
                 st.error("Invalid credentials")
 
     # ---------- HOME ----------
@@ -122,18 +141,16 @@ def render_customer_flow():
         # -----------------------------
         # Notifications from Loan Officer
         # -----------------------------
-        NOTIFY_FILE = "data/notifications.csv"
         customer_id = st.session_state.logged_customer["Customer_ID"]
 
-        notifications = []
-        if os.path.exists(NOTIFY_FILE):
-            with open(NOTIFY_FILE, newline="", encoding="utf-8") as f:
-                for row in csv.DictReader(f):
-                    if row["Customer_ID"] == customer_id:
-                        notifications.append(row)
+        notifications = inbox(customer_id)
+        unread = unread_count(customer_id)
 
         if notifications:
-            st.markdown("### 🔔 Notifications")
+            if unread:
+                st.markdown(f"### 🔔 Notifications ({unread} new)")
+            else:
+                st.markdown("### 🔔 Notifications")
             for n in reversed(notifications):
                 st.success(
                     f"""
@@ -142,6 +159,7 @@ def render_customer_flow():
                     🕒 {n['Created_At']}
                     """
                 )
+            mark_seen(customer_id)
         else:
             st.info("No notifications yet. Please check back later.")
 
@@ -377,13 +395,15 @@ def render_customer_flow():
         st.markdown("### Loan Details")
         st.divider()
 
+        rate = current_rate()
         gold_value = (
             st.session_state.net_weight *
-            GOLD_RATE_PER_GRAM *
+            rate["rate"] *
             PURITY_FACTOR[st.session_state.carat]
         )
 
         st.write("Gold Value:", int(gold_value))
+        st.caption(f"Gold rate ₹{rate['rate']:g}/g (as of {rate['as_of']})")
 
         with st.expander("Monthly EMI Gold Loan (Demo)", expanded=True):
 
@@ -391,7 +411,7 @@ def render_customer_flow():
                 "Note: EMI scheme shown for academic demonstration only."
             )
 
-            max_amt = int(gold_value * 0.75)
+            max_amt = int(gold_value * MAX_LTV)
 
             if max_amt < 20000:
                 st.error("Gold value insufficient for minimum loan eligibility.")
@@ -407,20 +427,35 @@ def render_customer_flow():
 
             tenure = st.slider("Tenure (Months)", 1, 36, 36)
 
-            emi, explanation = emi_calculation_agent(
-                loan_amt, 9.95, tenure
+            # Whole what-if grid is computed once; slider moves are lookups
+            grid = emi_grid(max_amt, GOLD_LOAN_INTEREST_RATE)
+            emi, total_interest = grid_lookup(grid, loan_amt, tenure)
+            explanation = emi_explanation(
+                loan_amt, GOLD_LOAN_INTEREST_RATE, tenure
             )
 
             st.write("EMI:", emi)
+            st.write("Total Interest:", total_interest)
             st.info(explanation.get("Decision Rationale", ""))
 
+            row = grid["row"][loan_amt]
+            st.caption("EMI and total interest by tenure for this amount")
+            by_tenure = {
+                "Tenure (Months)": grid["tenures"],
+                "EMI": grid["emi"][row],
+                "Total Interest": grid["total_interest"][row]
+            }
+            st.line_chart(by_tenure, x="Tenure (Months)", y="EMI")
+            st.bar_chart(by_tenure, x="Tenure (Months)", y="Total Interest")
+
         if st.button("Next"):
             st.session_state.loan_summary = {
             "gold_value": int(gold_value),
             "loan_amount": loan_amt,
             "tenure_months": tenure,
             "emi": emi,
-            "interest_rate": 9.95
+            "interest_rate": GOLD_LOAN_INTEREST_RATE,
+            "gold_rate": rate
             }
             st.session_state.page = "gold_step4"
             st.rerun()
@@ -439,9 +474,25 @@ def render_customer_flow():
         if uploaded:
             file_bytes = uploaded.getvalue()
 
-            extracted, error = extract_identity_from_image(file_bytes)
+            # Runs in the background; same image -> same job across reruns
+            st.session_state.kyc_job = submit_extraction(file_bytes)
+            state, extracted, error = job_status(st.session_state.kyc_job)
 
-            if error:
+            if st.session_state.kyc_job is None:
+                st.session_state.verification_result = None
+                st.warning(
+                    "⏳ Document verification is busy right now. "
+                    "Please try again in a moment."
+                )
+                st.button("🔄 Try again")
+            elif state == "PENDING":
+                st.session_state.verification_result = None
+                st.info(
+                    "⏳ Verifying your document in the background. "
+                    "You can continue to the summary meanwhile."
+                )
+                st.button("🔄 Check status")
+            elif error:
                 st.error("❌ Document could not be processed. Manual verification required.")
                 st.session_state.verification_result = None
             else:
@@ -449,10 +500,9 @@ def render_customer_flow():
                 st.session_state.verification_result = extracted
 
                 # OPTIONAL: auto-fail if nothing extracted
-                if not extracted["name"] and not extracted["aadhaar_last4"]:
-                    st.session_state.document_failure_reason = (
-                        "Identity details could not be confidently extracted from document."
-                    )
+                reason = extraction_failure_reason(extracted, None)
+                if reason:
+                    st.session_state.document_failure_reason = reason
 
                 st.success("✅ Document uploaded successfully")
 
@@ -540,22 +590,41 @@ def render_customer_flow():
                 "document_failure_reason", ""
             )
 
-            with open("data/applications.csv", "a", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow([
-                    application_id,
-                    customer["Customer_ID"],
-                    summary["loan_amount"],
-                    summary["tenure_months"],
-                    st.session_state.net_weight,
-                    st.session_state.carat,
-                    "SUBMITTED",
-                    failure_reason,
-                    extracted.get("name", ""),
-                    extracted.get("dob", ""),
-                    extracted.get("aadhaar_last4", ""),
-                    datetime.now().isoformat()
-                ])
+            # Background extraction may have finished after step 4
+            kyc_job = st.session_state.get("kyc_job")
+            kyc_state = job_status(kyc_job)[0] if kyc_job else None
+            if kyc_state == "DONE" and not extracted:
+                done, error = job_status(kyc_job)[1:]
+                if not error:
+                    extracted = done
+                    failure_reason = extraction_failure_reason(done, None)
+
+            app_row = [
+                application_id,
+                customer["Customer_ID"],
+                summary["loan_amount"],
+                summary["tenure_months"],
+                st.session_state.net_weight,
+                st.session_state.carat,
+                "SUBMITTED",
+                failure_reason,
+                extracted.get("name", ""),
+                extracted.get("dob", ""),
+                extracted.get("aadhaar_last4", ""),
+                datetime.now().isoformat()
+            ]
+            offset = append_row(APP_FILE, app_row)
+            enqueue(application_id, offset, "SUBMITTED")
+
+            # Identity match + risk computed once, stored for the officer
+            score_and_save(
+                dict(zip(APP_HEADER, (str(v) for v in app_row))), customer
+            )
+            record_rate_snapshot(application_id, summary["gold_rate"])
+
+            # Extraction still running: attach its result when it lands
+            if kyc_state == "PENDING":
+                attach_when_done(kyc_job, application_id)
 
 
             st.session_state.application_id = application_id
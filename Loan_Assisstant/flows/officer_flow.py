@@ -1,32 +1,61 @@
-import streamlit as st
 import csv
-from datetime import date, datetime
+import io
+import time
+import streamlit as st
+from datetime import date, timedelta
+
+from core.repository import (
+    AUDIT_HEADER,
+    CUSTOMER_FILE,
+    OFFICER_FILE,
+    VISIT_FILE,
+    find_rows,
+    find_one,
+    read_rows
+)
+from core.status_log import record_status_change, status_event
+from core.pending_queue import pending_applications, on_status_change
+from core.inbox import notification
+from core.group_commit import commit
+from core import audit_log
+from core.kyc_jobs import with_late_result
+from core.amortization import schedules_for, schedule_summary
+from core.config import GOLD_LOAN_INTEREST_RATE
+from core.scoring import application_score, score_application, risk_sort_key
+from core.identity_match import REPORT_FILE, report_for_customer
 
 # =============================
-# FILE PATHS
+# HELPERS
 # =============================
-APP_FILE = "data/applications.csv"
-AUDIT_FILE = "data/audit_logs.csv"
-VISIT_FILE = "data/branch_visits.csv"
-NOTIFY_FILE = "data/notifications.csv"
-OFFICER_FILE = "data/loan_officers.csv"
+def update_application_status(application_id, new_status, old_status=""):
+    record_status_change(
+        application_id,
+        old_status,
+        new_status,
+        st.session_state.get("officer_name") or "SYSTEM"
+    )
+    on_status_change(application_id, new_status)
 
 
-# =============================
-# HELPERS
-# =============================
-def update_application_status(application_id, new_status):
-    with open(APP_FILE, newline="", encoding="utf-8") as f:
-        rows = list(csv.DictReader(f))
+def commit_decision(app, new_status, writes, action, details):
+    """
+    Writes the status change and its related rows as one group commit,
+    then the audit entry; returns once both are durable.
+    """
+    officer = st.session_state.get("officer_name") or "SYSTEM"
+    commit([
+        status_event(app["Application_ID"], app["Status"], new_status, officer)
+    ] + writes)
+    on_status_change(app["Application_ID"], new_status)
+    audit_log.log(officer, app["Application_ID"], action, details, wait=True)
 
-    for r in rows:
-        if r["Application_ID"] == application_id:
-            r["Status"] = new_status
 
-    with open(APP_FILE, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=rows[0].keys())
-        writer.writeheader()
-        writer.writerows(rows)
+def audit_csv(rows):
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=AUDIT_HEADER)
+    writer.writeheader()
+    writer.writerows(rows)
+    return out.getvalue()
 
 
 def branches():
@@ -37,30 +66,6 @@ def branches():
     }
 
 
-# =============================
-# SAFE AGENTS (EXPLANATION ONLY)
-# =============================
-def document_validation_agent(app):
-    required = ["Requested_Amount", "Net_Weight", "Carat"]
-    return [f for f in required if not app.get(f)]
-
-
-def policy_compliance_agent(app):
-    return 0.82, (
-        "The requested loan amount falls within permissible "
-        "Loan-to-Value thresholds for the given gold purity."
-    )
-
-
-def risk_evaluation_agent(app):
-    amount = float(app["Requested_Amount"])
-    if amount > 500000:
-        return "HIGH", "Requested amount exceeds retail gold loan limits."
-    elif amount > 200000:
-        return "MEDIUM", "Moderate exposure based on loan amount."
-    return "LOW", "Low exposure based on conservative loan amount."
-
-
 # =============================
 # OFFICER FLOW
 # =============================
@@ -89,13 +94,12 @@ def render_officer_flow():
         pin = st.text_input("PIN", type="password")
 
         if st.button("Login"):
-            with open(OFFICER_FILE, newline="", encoding="utf-8") as f:
-                for r in csv.DictReader(f):
-                    if r["EmpCode"] == emp and r["PIN"] == pin:
-                        st.session_state.officer_logged_in = True
-                        st.session_state.officer_name = r["Name"]
-                        st.success(f"Welcome {r['Name']}")
-                        st.rerun()
+            for r in find_rows(OFFICER_FILE, "EmpCode", emp):
+                if r["PIN"] == pin:
+                    st.session_state.officer_logged_in = True
+                    st.session_state.officer_name = r["Name"]
+                    st.success(f"Welcome {r['Name']}")
+                    st.rerun()
         return
 
 
@@ -111,11 +115,32 @@ def render_officer_flow():
     # -----------------------------
     st.markdown("## 🗂 Pending Applications")
 
-    pending_apps = []
-    with open(APP_FILE, newline="", encoding="utf-8") as f:
-        for r in csv.DictReader(f):
-            if r["Status"] in ["SUBMITTED", "UNDER_REVIEW"]:
-                pending_apps.append(r)
+    pending_apps = pending_applications()
+
+    # Scores are computed at submission; only legacy rows are scored here
+    scores = {a["Application_ID"]: application_score(a) for a in pending_apps}
+
+    col_f, col_s = st.columns(2)
+    with col_f:
+        risk_filter = st.multiselect(
+            "Filter by risk", ["HIGH", "MEDIUM", "LOW"],
+            default=["HIGH", "MEDIUM", "LOW"]
+        )
+    with col_s:
+        sort_by = st.selectbox(
+            "Sort by", ["Submission order", "Risk (high first)", "Risk (low first)"]
+        )
+
+    pending_apps = [
+        a for a in pending_apps
+        if not scores[a["Application_ID"]]
+        or scores[a["Application_ID"]]["Risk"] in risk_filter
+    ]
+    if sort_by != "Submission order":
+        pending_apps.sort(
+            key=lambda a: risk_sort_key(scores[a["Application_ID"]]),
+            reverse=sort_by == "Risk (low first)"
+        )
 
 
     if not pending_apps and not st.session_state.evaluated_app:
@@ -123,31 +148,96 @@ def render_officer_flow():
 
 
 
-    for i, app in enumerate(pending_apps):
+    for app in pending_apps:
+        score = scores[app["Application_ID"]]
         with st.container():
             st.markdown(f"""
             **Application ID:** {app['Application_ID']}  
             **Customer ID:** {app['Customer_ID']}  
             **Amount:** ₹{app['Requested_Amount']}  
             **Tenure:** {app['Tenure']} months  
-            **Gold:** {app['Net_Weight']} g | {app['Carat']}K
+            **Gold:** {app['Net_Weight']} g | {app['Carat']}K  
+            **Risk:** {score['Risk'] if score else 'Not scored'}
             """)
 
-            if st.button("Evaluate", key=f"eval_{i}"):
+            if st.button("Evaluate", key=f"eval_{app['Application_ID']}"):
+                update_application_status(
+                    app["Application_ID"], "UNDER_REVIEW", app["Status"]
+                )
+                app["Status"] = "UNDER_REVIEW"
                 st.session_state.evaluated_app = app
-                update_application_status(app["Application_ID"], "UNDER_REVIEW")
                 st.rerun()
 
         st.divider()
 
 
+    # -----------------------------
+    # DUPLICATE IDENTITY REPORT
+    # -----------------------------
+    with st.expander("🕵️ Possible Duplicate Identities"):
+        report = read_rows(REPORT_FILE)
+        if not report:
+            st.caption("No report yet. Run: python -m tools.identity_report")
+        else:
+            st.caption(
+                f"{len(report)} flagged pair(s) in "
+                f"{len({r['Ring_ID'] for r in report})} group(s), "
+                f"generated {report[0]['Generated_At']}"
+            )
+            st.dataframe(report, hide_index=True)
+
+
+    # -----------------------------
+    # AUDIT TRAIL (indexed, see core.audit_index)
+    # -----------------------------
+    with st.expander("📜 Audit Trail"):
+        col_a, col_o = st.columns(2)
+        with col_a:
+            audit_app = st.text_input("Application ID", key="audit_app")
+        with col_o:
+            audit_officer = st.selectbox(
+                "Officer", ["Any"] + audit_log.officers(), key="audit_officer"
+            )
+        all_dates = st.checkbox("All dates", key="audit_all_dates")
+        audit_dates = st.date_input(
+            "Date range",
+            value=(date.today() - timedelta(days=7), date.today()),
+            disabled=all_dates,
+            key="audit_dates"
+        )
+
+        if st.button("Search Audit Trail"):
+            start = end = None
+            if not all_dates and audit_dates:
+                start = audit_dates[0].isoformat()
+                end = (audit_dates[-1] + timedelta(days=1)).isoformat()
+
+            began = time.perf_counter()
+            trail = audit_log.query(
+                application_id=audit_app.strip() or None,
+                officer=None if audit_officer == "Any" else audit_officer,
+                start=start,
+                end=end
+            )
+            st.caption(
+                f"{len(trail)} entries in "
+                f"{(time.perf_counter() - began) * 1000:.1f} ms"
+            )
+            if trail:
+                st.dataframe(trail, hide_index=True)
+                st.download_button(
+                    "Export CSV", audit_csv(trail),
+                    file_name="audit_trail.csv", mime="text/csv"
+                )
+
+
     # -----------------------------
     # LOAD SELECTED APPLICATION
     # -----------------------------
     if not st.session_state.evaluated_app:
         return
 
-    app = st.session_state.evaluated_app
+    app = with_late_result(st.session_state.evaluated_app)
 
     st.info(f"🕒 Reviewing Application: {app['Application_ID']} (Status: {app['Status']})")
 
@@ -155,19 +245,17 @@ def render_officer_flow():
     # -----------------------------
     # CUSTOMER MASTER DETAILS
     # -----------------------------
-    customer_data = None
-
-    with open("data/customers.csv", newline="", encoding="utf-8") as f:
-        for r in csv.DictReader(f):
-            if r["Customer_ID"] == app["Customer_ID"]:
-                customer_data = r
-                break
+    customer_data = find_one(CUSTOMER_FILE, "Customer_ID", app["Customer_ID"])
     if not customer_data:
         st.error("Customer master data not found. Escalate to operations.")
         return
 
     st.markdown("## 🧾 Identity Verification (Officer Review)")
 
+    for r in report_for_customer(customer_data["Customer_ID"]):
+        other = r["Name_B"] if r["Customer_A"] == customer_data["Customer_ID"] else r["Name_A"]
+        st.warning(f"⚠️ {r['Reason']}: {other} (group {r['Ring_ID']}, score {r['Score']})")
+
 
     col1, col2 = st.columns(2)
 
@@ -187,41 +275,26 @@ def render_officer_flow():
         )
 
     # -----------------------------
-    # SMART AGENT ANALYSIS (RULE-BASED)
+    # SMART AGENT ANALYSIS (RULE-BASED, PRECOMPUTED)
     # -----------------------------
     st.markdown("## 🧠 Agent Analysis")
 
-    ex_name = app.get("Extracted_Name")
-    ex_dob = app.get("Extracted_DOB")
-    ex_id = app.get("Extracted_ID_Last4")
-
-    cust_name = customer_data["Full_Name"]
-    cust_dob = customer_data["DOB"]
-    cust_id_last4 = customer_data["Aadhaar"][-4:]
+    score = application_score(app) or score_application(app, customer_data)
 
     # ---------- REQUIRED FIELDS CHECK
-    if ex_name and ex_dob and ex_id:
+    if score["Fields_OK"] == "1":
         st.success("✅ Required identity fields detected from document")
-        required_ok = True
     else:
         st.error("❌ Required identity fields missing in document")
-        required_ok = False
 
     # ---------- MATCH CHECKS
-    name_match = ex_name and ex_name.lower() in cust_name.lower()
-    dob_match = ex_dob and ex_dob in cust_dob
-    id_match = ex_id and ex_id == cust_id_last4
+    name_match = score["Name_Match"] == "1"
+    dob_match = score["DOB_Match"] == "1"
+    id_match = score["ID_Match"] == "1"
 
     # ---------- RISK LOGIC
-    if name_match and dob_match and id_match:
-        risk = "LOW"
-        risk_msg = "All identity fields match customer records."
-    elif name_match and id_match:
-        risk = "MEDIUM"
-        risk_msg = "Name and ID match, but DOB mismatch or missing."
-    else:
-        risk = "HIGH"
-        risk_msg = "Identity mismatch or insufficient document verification."
+    risk = score["Risk"]
+    risk_msg = score["Risk_Reason"]
 
     # ---------- DISPLAY RESULTS
     st.write("🔍 Name Match:", "✅" if name_match else "❌")
@@ -249,6 +322,19 @@ def render_officer_flow():
 
 
 
+    # -----------------------------
+    # REPAYMENT SCHEDULE
+    # -----------------------------
+    with st.expander("📅 Repayment Schedule (actual-days interest)"):
+        rows = schedules_for([app], GOLD_LOAN_INTEREST_RATE)[app["Application_ID"]]
+        totals = schedule_summary(rows)
+        st.write(
+            f"**Total Interest:** ₹{totals['Total_Interest']}  |  "
+            f"**Total Payable:** ₹{totals['Total_Payable']}"
+        )
+        st.dataframe(rows, hide_index=True)
+
+
     # -----------------------------
     # OFFICER DECISION
     # -----------------------------
@@ -299,35 +385,22 @@ def render_officer_flow():
             submit = st.form_submit_button("Confirm Slot")
 
         if submit:
-            update_application_status(app["Application_ID"], "VISIT_SCHEDULED")
-
-            with open(VISIT_FILE, "a", newline="", encoding="utf-8") as f:
-                csv.writer(f).writerow([
+            commit_decision(app, "VISIT_SCHEDULED", [
+                (VISIT_FILE, [
                     app["Application_ID"],
                     branch,
                     branches()[branch],
                     visit_date.isoformat(),
                     visit_time.strftime("%H:%M"),
                     "BRANCH_VISIT_SCHEDULED"
-                ])
-
-            with open(NOTIFY_FILE, "a", newline="", encoding="utf-8") as f:
-                csv.writer(f).writerow([
+                ]),
+                notification(
                     app["Customer_ID"],
                     app["Application_ID"],
                     "SYSTEM",
-                    f"Branch visit scheduled at {branch} on {visit_date} at {visit_time}.",
-                    datetime.now().isoformat()
-                ])
-
-            with open(AUDIT_FILE, "a", newline="", encoding="utf-8") as f:
-                csv.writer(f).writerow([
-                    datetime.now().isoformat(),
-                    st.session_state.officer_name,
-                    app["Application_ID"],
-                    "IDENTITY_MATCH_CONFIRMED",
-                    "Proceed to branch visit"
-                ])
+                    f"Branch visit scheduled at {branch} on {visit_date} at {visit_time}."
+                )
+            ], "IDENTITY_MATCH_CONFIRMED", "Proceed to branch visit")
 
             st.success("✅ Slot booked and customer notified")
             st.session_state.evaluated_app = None
@@ -343,27 +416,15 @@ def render_officer_flow():
             if remarks.strip():
                 final_reason += f" | Officer remarks: {remarks}"
 
-            update_application_status(app["Application_ID"], "REJECTED")
-
-            # ---- Notify Customer
-            with open(NOTIFY_FILE, "a", newline="", encoding="utf-8") as f:
-                csv.writer(f).writerow([
+            commit_decision(app, "REJECTED", [
+                # ---- Notify Customer
+                notification(
                     app["Customer_ID"],
                     app["Application_ID"],
                     "LOAN_OFFICER",
-                    f"Loan application rejected. Reason: {final_reason}",
-                    datetime.now().isoformat()
-                ])
-
-            # ---- Audit Log (internal)
-            with open(AUDIT_FILE, "a", newline="", encoding="utf-8") as f:
-                csv.writer(f).writerow([
-                    datetime.now().isoformat(),
-                    st.session_state.officer_name,
-                    app["Application_ID"],
-                    "APPLICATION_REJECTED",
-                    final_reason
-                ])
+                    f"Loan application rejected. Reason: {final_reason}"
+                )
+            ], "APPLICATION_REJECTED", final_reason)   # ---- Audit Log (internal)
 
             st.error("❌ Application rejected and customer notified")
             st.session_state.evaluated_app = None
@@ -0,0 +1,111 @@
+"""
+Benchmark: indexed audit-trail queries vs. a scan of the whole log.
+
+Writes --entries synthetic audit entries (one in five a large
+SYSTEM_EVALUATION text, --days days, 40 officers) through
+core.audit_log in a temp store, so they rotate into gzip segments and
+get indexed as written. Then, with the index reloaded from disk as a
+fresh process would, times the compliance queries and checks each
+answer against a full scan.
+
+Usage (from Loan_Assisstant/):
+    python -m tools.bench_audit_index --entries 200000
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from core import audit_index, audit_log
+from tools.bench_audit_log import EVALUATION
+
+OFFICERS = [f"Officer {n:02d}" for n in range(40)]
+
+
+def write_log(entries, days, seed=3):
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1)
+    step = timedelta(days=days) / entries
+    apps = max(1, entries // 8)
+    for i in range(entries):
+        app = f"GL-{rng.randrange(apps):08X}"
+        action, details = (
+            ("SYSTEM_EVALUATION", EVALUATION.format(app=app)) if i % 5 == 0
+            else (rng.choice(["IDENTITY_MATCH_CONFIRMED", "APPLICATION_REJECTED"]),
+                  "Proceed to branch visit")
+        )
+        audit_log.log(rng.choice(OFFICERS), app, action, details,
+                      (start + step * i).isoformat())
+    audit_log.flush()
+    return start
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def matches(entry, application_id=None, officer=None, start=None, end=None):
+    return (
+        (application_id is None or entry["Application_ID"] == application_id)
+        and (officer is None or entry["Officer"] == officer)
+        and (start is None or entry["Timestamp"] >= start)
+        and (end is None or entry["Timestamp"] < end)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit index benchmark")
+    parser.add_argument("--entries", type=int, default=200000)
+    parser.add_argument("--days", type=int, default=60)
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    workdir = tempfile.mkdtemp()
+    os.chdir(workdir)
+    try:
+        os.makedirs("data")
+        _, write = timed(lambda: write_log(args.entries, args.days))
+        first = datetime(2026, 1, 1)
+        size = sum(os.path.getsize(p) for p in audit_log.segments())
+
+        audit_index.reset()
+        _, load = timed(audit_log.flush)
+
+        full, scan = timed(lambda: list(audit_log.iter_entries()))
+        some_app = full[len(full) // 2]["Application_ID"]
+        week_end = first + timedelta(days=args.days - 7)
+        cases = [
+            ("actions on one application", {"application_id": some_app}),
+            ("one officer, one week", {
+                "officer": OFFICERS[7],
+                "start": (week_end - timedelta(days=7)).isoformat(),
+                "end": week_end.isoformat()
+            }),
+            ("one-day export", {
+                "start": (first + timedelta(days=10)).isoformat(),
+                "end": (first + timedelta(days=11)).isoformat()
+            })
+        ]
+
+        print(f"{len(full):,} entries in {len(audit_log.segments())} segments "
+              f"({size / 1e6:.1f} MB gzip), written in {write:.1f}s")
+        print(f"index load {load * 1000:.0f} ms, full scan {scan * 1000:.0f} ms")
+        for name, filters in cases:
+            audit_index._member.cache_clear()
+            result, elapsed = timed(lambda: audit_log.query(**filters))
+            expected = [e for e in full if matches(e, **filters)]
+            print(f"{name:28s} {len(result):>7,} entries {elapsed * 1000:8.1f} ms  "
+                  f"matches scan: {result == expected}")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark: buffered, rotating audit log vs. one synchronous append per
+entry.
+
+Logs --entries audit entries (one in five a large multi-line
+SYSTEM_EVALUATION text) spread over several days, from --sessions
+threads, in a temp store. Reports the time a caller spends in log(),
+the on-disk size after gzip rotation, and checks that iter_entries()
+returns every entry in order across the segments.
+
+Usage (from Loan_Assisstant/):
+    python -m tools.bench_audit_log --entries 50000
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from core import audit_log
+from core.repository import AUDIT_FILE, append_row
+
+EVALUATION = """
+    Application ID: {app}
+    Officer: Anita Sharma
+    Document Check: OK
+    Policy Score: 0.82
+    Risk Level: MEDIUM
+
+    NOTE:
+    - This system does NOT approve loans.
+    - Physical gold verification is mandatory.
+""" * 4
+
+
+def entry(session, i, per_day):
+    day = 1 + i // per_day
+    app = f"GL-{session:04d}{i:06d}"
+    action, details = (
+        ("SYSTEM_EVALUATION", EVALUATION.format(app=app)) if i % 5 == 0
+        else ("IDENTITY_MATCH_CONFIRMED", "Proceed to branch visit")
+    )
+    return (
+        f"2026-01-{day:02d}T10:00:00.{session:03d}{i:03d}",
+        f"officer{session}", app, action, details
+    )
+
+
+def run(write, sessions, per_session, per_day):
+    spent = []
+
+    def session(n):
+        total = 0.0
+        for i in range(per_session):
+            timestamp, officer, app, action, details = entry(n, i, per_day)
+            start = time.perf_counter()
+            write(officer, app, action, details, timestamp)
+            total += time.perf_counter() - start
+        spent.append(total)
+
+    threads = [threading.Thread(target=session, args=(n,)) for n in range(sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return sum(spent) / (sessions * per_session)
+
+
+def sync_append(officer, app, action, details, timestamp):
+    append_row(AUDIT_FILE, [timestamp, officer, app, action, details])
+
+
+def disk_bytes():
+    total = os.path.getsize(AUDIT_FILE) if os.path.exists(AUDIT_FILE) else 0
+    return total + sum(os.path.getsize(p) for p in audit_log.segments())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit log benchmark")
+    parser.add_argument("--entries", type=int, default=50000)
+    parser.add_argument("--sessions", type=int, default=8)
+    args = parser.parse_args()
+
+    per_session = args.entries // args.sessions
+    per_day = max(1, per_session // 5)
+    total = per_session * args.sessions
+
+    cwd = os.getcwd()
+    workdir = tempfile.mkdtemp()
+    os.chdir(workdir)
+    try:
+        os.makedirs("data")
+        sync = run(sync_append, args.sessions, per_session, per_day)
+        raw = os.path.getsize(AUDIT_FILE)
+        os.remove(AUDIT_FILE)
+
+        buffered = run(audit_log.log, args.sessions, per_session, per_day)
+        start = time.perf_counter()
+        audit_log.rotate()
+        drain = time.perf_counter() - start
+
+        start = time.perf_counter()
+        entries = list(audit_log.iter_entries())
+        read = time.perf_counter() - start
+        # threads interleave, but each session's entries must keep their order
+        ordered = all(
+            [e["Timestamp"] for e in entries if e["Officer"] == f"officer{n}"]
+            == [entry(n, i, per_day)[0] for i in range(per_session)]
+            for n in range(args.sessions)
+        )
+
+        print(f"{total:,} entries, {len(audit_log.segments())} segments")
+        print(f"caller time per entry: sync append {sync * 1e6:.1f} us, "
+              f"buffered log() {buffered * 1e6:.1f} us")
+        print(f"final flush + rotation: {drain * 1000:.0f} ms")
+        print(f"on disk: {raw / 1e6:.1f} MB plain -> {disk_bytes() / 1e6:.2f} MB gzip")
+        print(f"read back {len(entries):,} entries in {read:.2f}s, "
+              f"complete and in order: {len(entries) == total and ordered}")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
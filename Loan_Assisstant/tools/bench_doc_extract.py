@@ -0,0 +1,108 @@
+"""
+Benchmark: streaming entity extraction vs. read-all + three searches.
+
+Checks that stream_entities gives the same result at several chunk
+sizes as scanning the whole text (small chunks force matches across
+chunk boundaries) and counts where it differs from the original three
+searches. Then times both on a large multi-page export with the
+identity block on the first or last page.
+
+Usage (from Loan_Assisstant/):
+    python -m tools.bench_doc_extract --pages 20000
+"""
+
+import argparse
+import io
+import random
+import re
+import time
+
+from core.doc_verification import ner_entity_extraction, stream_entities
+
+FILLER = (
+    "Statement page {page}. Transactions and remarks follow, "
+    "reference 12-34 ref 5678 ok.\n"
+) * 20
+IDENTITY = "Name: Ravi Kumar\nDOB: 14/08/1991\nAadhaar: 1234 5678 9012\n"
+
+
+def legacy_extract(data):
+    text = data.decode("utf-8", errors="ignore")
+    name = re.search(r"Name[:\- ]+([A-Za-z ]+)", text)
+    dob = re.search(r"\b\d{2}[-/]\d{2}[-/]\d{4}\b", text)
+    aadhaar = re.search(r"\b\d{4}\s?\d{4}\s?\d{4}\b", text)
+    return {
+        "name": name.group(1).strip() if name else None,
+        "dob": dob.group() if dob else None,
+        "id_number": aadhaar.group() if aadhaar else None
+    }
+
+
+def random_document(rng):
+    parts = []
+    for _ in range(rng.randint(1, 30)):
+        parts.append(rng.choice([
+            "Name: " + rng.choice(["Asha Rao", "Kiran", "Meena K Iyer"]),
+            "Name-" + rng.choice(["Suresh", "Priya Das"]),
+            f"{rng.randint(0, 99):02d}-{rng.randint(0, 99):02d}-{rng.randint(1000, 9999)}",
+            " ".join(f"{rng.randint(0, 9999):04d}" for _ in range(3)),
+            str(rng.randrange(10**14)),
+            "résumé ₹ 1234",
+            "\n",
+            "filler text " * rng.randint(1, 5)
+        ]))
+        parts.append(rng.choice([" ", "\n", ", ", ""]))
+    return "".join(parts).encode("utf-8")
+
+
+def check_agreement(count=2000, seed=9):
+    """
+    Returns (chunked results differing from the in-memory scan,
+    documents where the single pass differs from the old searches).
+    The latter only happens when two old matches overlapped, e.g. an
+    "Aadhaar" read across the end of a date.
+    """
+    rng = random.Random(seed)
+    chunk_mismatches = legacy_differences = 0
+    for _ in range(count):
+        data = random_document(rng)
+        expected = ner_entity_extraction(data.decode("utf-8", errors="ignore"))
+        legacy_differences += expected != legacy_extract(data)
+        for chunk_size in (1, 7, 64, 4096):
+            if stream_entities(io.BytesIO(data), chunk_size) != expected:
+                chunk_mismatches += 1
+    return chunk_mismatches, legacy_differences
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Entity extraction benchmark")
+    parser.add_argument("--pages", type=int, default=20000)
+    args = parser.parse_args()
+
+    chunk_mismatches, legacy_differences = check_agreement()
+    print(f"chunk-boundary mismatches: {chunk_mismatches}")
+    print(f"overlapping-match differences vs. old searches: {legacy_differences}")
+
+    body = "".join(FILLER.format(page=p) for p in range(args.pages))
+    for position in ("first", "last"):
+        text = IDENTITY + body if position == "first" else body + IDENTITY
+        data = text.encode("utf-8")
+        old = timed(lambda: legacy_extract(io.BytesIO(data).read()))
+        new = timed(lambda: stream_entities(io.BytesIO(data)))
+        print(
+            f"{len(data) / 1e6:.1f} MB, identity on {position} page: "
+            f"read-all {old * 1000:.1f} ms, streaming {new * 1000:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark: officer decisions written row by row vs. group commit.
+
+Each of --sessions threads confirms --decisions branch slots (status
+event, visit, notification) in a temp store, either as three separate
+appends (fsync'd, as durable as a group commit) or through
+core.group_commit. Reports decisions/s, batch sizes and commit latency,
+then checks that every decision's rows were written together.
+
+Usage (from Loan_Assisstant/):
+    python -m tools.bench_group_commit --sessions 16 --decisions 200
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from core import group_commit
+from core.inbox import notification
+from core.repository import (
+    NOTIFY_FILE,
+    VISIT_FILE,
+    VISIT_HEADER,
+    append_rows,
+    ensure_table,
+    read_rows
+)
+from core.status_log import STATUS_LOG_FILE, status_event
+
+
+def decision(session, i):
+    app_id = f"GL-{session:04d}{i:06d}"
+    return [
+        status_event(app_id, "UNDER_REVIEW", "VISIT_SCHEDULED", f"officer{session}"),
+        (VISIT_FILE, [app_id, "Mumbai Main Branch", "BR001", "2026-01-01",
+                      "10:00", "BRANCH_VISIT_SCHEDULED"]),
+        notification(f"C{session}", app_id, "SYSTEM", "Branch visit scheduled.")
+    ]
+
+
+def write_separately(writes):
+    for path, row in writes:
+        append_rows(path, [row], fsync=True)
+
+
+def run(mode, sessions, decisions):
+    latencies = []
+
+    def session(n):
+        for i in range(decisions):
+            writes = decision(n, i)
+            start = time.perf_counter()
+            if mode == "group":
+                group_commit.commit(writes)
+            else:
+                write_separately(writes)
+            latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=session, args=(n,)) for n in range(sessions)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start, sorted(latencies)
+
+
+def check_complete(expected):
+    """
+    Every application id must appear in all three tables.
+    """
+    ids = [
+        {r["Application_ID"] for r in read_rows(path)}
+        for path in (STATUS_LOG_FILE, VISIT_FILE, NOTIFY_FILE)
+    ]
+    return all(len(s) == expected for s in ids) and len(set.union(*ids)) == expected
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Group commit benchmark")
+    parser.add_argument("--sessions", type=int, default=16)
+    parser.add_argument("--decisions", type=int, default=200)
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    for mode in ("separate", "group"):
+        workdir = tempfile.mkdtemp()
+        os.chdir(workdir)
+        try:
+            os.makedirs("data")
+            ensure_table(VISIT_FILE, VISIT_HEADER)
+            elapsed, latencies = run(mode, args.sessions, args.decisions)
+            complete = check_complete(args.sessions * args.decisions)
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(workdir)
+
+        total = args.sessions * args.decisions
+        print(
+            f"{mode:9s} {total / elapsed:8.0f} decisions/s  "
+            f"p50 {latencies[len(latencies) // 2] * 1000:6.1f} ms  "
+            f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:6.1f} ms  "
+            f"all rows present: {complete}"
+        )
+
+    s = group_commit.stats()
+    print(
+        f"group commit: {s['batches']} batches, avg {s['avg_batch']:.1f} / "
+        f"max {s['max_batch']} decisions per batch, "
+        f"avg latency {s['avg_latency'] * 1000:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
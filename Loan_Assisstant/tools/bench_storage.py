@@ -0,0 +1,141 @@
+"""
+Benchmark: CSV store vs. SQLite store through core.repository.
+
+For each size, builds a synthetic store in a temp directory (N
+customers, N applications), migrates it to SQLite, then times the
+same repository calls on both backends:
+
+- first lookup (CSV: builds the Mobile index; SQLite: index exists)
+- 1000 point lookups by Mobile
+- 1000 single-row application appends
+- first unique-checked registration (CSV: builds PAN / Aadhaar indexes)
+- 200 more registrations
+- one full read of applications
+
+Usage (from Loan_Assisstant/):
+    python -m tools.bench_storage --rows 100000,1000000
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from core.repository import (
+    APP_FILE,
+    APP_HEADER,
+    CUSTOMER_FILE,
+    CUSTOMER_HEADER,
+    CUSTOMER_UNIQUE_FIELDS,
+    append_row,
+    append_unique_row,
+    find_rows,
+    read_rows,
+    set_backend
+)
+from tools.migrate_to_sqlite import migrate
+
+
+def _letters(n, width=5):
+    return "".join(chr(65 + n // 26 ** k % 26) for k in range(width))
+
+
+def customer_row(i):
+    return [
+        f"C{i:09d}", "Asha Rao", "1990-01-01", "Female", str(6000000000 + i),
+        "a@b.co", "Addr", f"{_letters(i // 10000)}{i % 10000:04d}Z",
+        f"{i:012d}", "1234"
+    ]
+
+
+def app_row(i):
+    return [
+        f"GL-{i:08X}", f"C{i:09d}", "150000", "12", "40.0", "22",
+        "SUBMITTED", "", "", "", "", "2026-01-01T10:00:00"
+    ]
+
+
+def write_store(rows):
+    os.makedirs("data")
+    for path, header, make in (
+        (CUSTOMER_FILE, CUSTOMER_HEADER, customer_row),
+        (APP_FILE, APP_HEADER, app_row)
+    ):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(make(i) for i in range(rows))
+
+
+def quiet_migrate(db):
+    with contextlib.redirect_stdout(io.StringIO()):
+        migrate(db)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run_backend(rows, seed=1):
+    rng = random.Random(seed)
+    mobiles = [str(6000000000 + rng.randrange(rows)) for _ in range(1000)]
+    result = {}
+
+    result["first lookup"] = timed(
+        lambda: find_rows(CUSTOMER_FILE, "Mobile", mobiles[0])
+    )
+    result["1000 lookups"] = timed(
+        lambda: [find_rows(CUSTOMER_FILE, "Mobile", m) for m in mobiles]
+    )
+    result["1000 appends"] = timed(
+        lambda: [append_row(APP_FILE, app_row(rows + i)) for i in range(1000)]
+    )
+    register = lambda i: append_unique_row(
+        CUSTOMER_FILE, customer_row(rows + i), CUSTOMER_UNIQUE_FIELDS
+    )
+    result["first registration"] = timed(lambda: register(0))
+    result["200 registrations"] = timed(
+        lambda: [register(i) for i in range(1, 201)]
+    )
+    result["full read"] = timed(lambda: read_rows(APP_FILE))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Storage backend benchmark")
+    parser.add_argument("--rows", default="100000,1000000")
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    for rows in (int(r) for r in args.rows.split(",")):
+        workdir = tempfile.mkdtemp()
+        os.chdir(workdir)
+        try:
+            write_store(rows)
+            db = os.path.join(workdir, "data", "bench.db")
+            load = timed(lambda: quiet_migrate(db))
+
+            set_backend("csv")
+            csv_result = run_backend(rows)
+            set_backend("sqlite", db)
+            sqlite_result = run_backend(rows)
+            set_backend("csv")
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(workdir)
+
+        print(f"\n{rows:,} customers / applications (migration {load:.1f}s)")
+        print(f"{'':20s} {'csv':>10s} {'sqlite':>10s}")
+        for name in csv_result:
+            print(f"{name:20s} {csv_result[name]:9.3f}s {sqlite_result[name]:9.3f}s")
+
+
+if __name__ == "__main__":
+    main()
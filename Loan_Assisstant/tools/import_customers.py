@@ -0,0 +1,286 @@
+"""
+Bulk customer import from a branch export (CSV or JSONL).
+
+The input is streamed in chunks of --batch-size records:
+
+- validation : each chunk goes through core.validation in one batch
+               (plus an ISO date check on DOB)
+- dedupe     : Mobile, PAN and Aadhaar must be new to the customer
+               master and to the chunk. SQLite checks them with its
+               own indexes (repository.append_unique_rows). On the CSV
+               store the master's values go into a temporary on-disk
+               key set (sqlite3, deleted on exit) instead of the
+               in-memory csv_index indexes; each chunk brings it level
+               with rows appended by others, then checks and appends
+               under repository.write_lock()
+- ids        : every accepted record gets a new Customer_ID
+- writes     : accepted records of a chunk are appended in one write
+               with one fsync; rejected ones go to --rejects with the
+               input line number and reason
+
+Memory stays constant whatever the size of the input or the master:
+one chunk of input plus the key set's page cache (KEY_CACHE_KB).
+
+Usage (from Loan_Assisstant/):
+    python -m tools.import_customers branch_042.csv
+    python -m tools.import_customers branch_042.jsonl --batch-size 5000
+"""
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import uuid
+from datetime import date
+from itertools import islice
+
+from core.repository import (
+    CUSTOMER_FILE,
+    CUSTOMER_HEADER,
+    CUSTOMER_UNIQUE_FIELDS,
+    append_rows,
+    append_unique_rows,
+    backend,
+    end_position,
+    ensure_table,
+    rows_after,
+    write_lock
+)
+from core.validation import error_messages, validate_records
+
+REJECT_HEADER = ["Line", "Reason"] + CUSTOMER_HEADER[1:]
+KEY_CACHE_KB = 8192
+
+
+# =============================
+# INPUT
+# =============================
+def _normalize(record):
+    row = {f: str(record.get(f) or "").strip() for f in CUSTOMER_HEADER[1:]}
+    row["PAN"] = row["PAN"].upper()
+    return row
+
+
+def read_records(path, fmt):
+    """
+    Yields (line number, record) pairs; record is None when the
+    line could not be parsed.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "jsonl":
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_no, _normalize(json.loads(line))
+                except (ValueError, AttributeError):
+                    yield line_no, None
+        else:
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield reader.line_num, _normalize(record)
+
+
+def _valid_date(value):
+    try:
+        date.fromisoformat(value)
+        return True
+    except ValueError:
+        return False
+
+
+# =============================
+# KEY SET (CSV STORE)
+# =============================
+def open_key_set():
+    """
+    Empty on-disk set of (field, value) pairs; "covered" is the
+    position of the last master row added to it.
+    """
+    fd, path = tempfile.mkstemp(suffix=".keys.db")
+    os.close(fd)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute(f"PRAGMA cache_size = -{KEY_CACHE_KB}")
+    conn.execute(
+        "CREATE TABLE keys (field TEXT, value TEXT, "
+        "PRIMARY KEY (field, value)) WITHOUT ROWID"
+    )
+    return {"conn": conn, "path": path, "covered": -1}
+
+
+def close_key_set(keys):
+    keys["conn"].close()
+    os.remove(keys["path"])
+
+
+def _add_keys(keys, rows):
+    keys["conn"].executemany(
+        "INSERT OR IGNORE INTO keys VALUES (?, ?)",
+        ((field, row.get(field, "")) for row in rows for field in CUSTOMER_UNIQUE_FIELDS)
+    )
+
+
+def _catch_up(keys):
+    """
+    Adds master rows past keys["covered"]; starts over if the master
+    was rewritten smaller. Call under write_lock().
+    """
+    if end_position(CUSTOMER_FILE) < keys["covered"]:
+        keys["conn"].execute("DELETE FROM keys")
+        keys["covered"] = -1
+
+    def tail():
+        for position, row in rows_after(CUSTOMER_FILE, keys["covered"]):
+            keys["covered"] = position
+            yield row
+
+    _add_keys(keys, tail())
+
+
+def _has_key(keys, field, value):
+    return keys["conn"].execute(
+        "SELECT 1 FROM keys WHERE field = ? AND value = ?", (field, value)
+    ).fetchone() is not None
+
+
+def append_new_rows(keys, rows):
+    """
+    Same contract as repository.append_unique_rows, checked against
+    the key set: (offset, None) per written row, (None, field) per
+    clash.
+    """
+    cols = [(field, CUSTOMER_HEADER.index(field)) for field in CUSTOMER_UNIQUE_FIELDS]
+    with write_lock():
+        _catch_up(keys)
+        clashes, accepted, seen = [], [], set()
+        for row in rows:
+            clash = next((
+                field for field, col in cols
+                if (field, row[col]) in seen or _has_key(keys, field, row[col])
+            ), None)
+            clashes.append(clash)
+            if clash is None:
+                seen.update((field, row[col]) for field, col in cols)
+                accepted.append(row)
+
+        offsets = append_rows(CUSTOMER_FILE, accepted, fsync=True) if accepted else []
+        if offsets:
+            _add_keys(keys, (dict(zip(CUSTOMER_HEADER, row)) for row in accepted))
+            keys["covered"] = offsets[-1]
+
+    offsets = iter(offsets)
+    return [
+        (None, clash) if clash else (next(offsets), None)
+        for clash in clashes
+    ]
+
+
+# =============================
+# CHUNK PROCESSING
+# =============================
+def _reject(rejects_writer, line_no, reason, row):
+    rejects_writer.writerow(
+        [line_no, reason] + [row[f] for f in CUSTOMER_HEADER[1:]]
+    )
+
+
+def process_chunk(chunk, rejects_writer, stats, keys=None):
+    """
+    Validates one chunk, then appends the valid rows in a single
+    fsync'd write; rows repeating a unique field are refused by
+    the write itself (checked against `keys` when given).
+    """
+    masks = iter(validate_records(r for _, r in chunk if r is not None))
+    candidates = []
+
+    for line_no, row in chunk:
+        if row is None:
+            rejects_writer.writerow([line_no, "Unreadable record"])
+            stats["invalid"] += 1
+            continue
+
+        errors = error_messages(next(masks))
+        if not _valid_date(row["DOB"]):
+            errors.append("Invalid DOB")
+        if errors:
+            _reject(rejects_writer, line_no, "; ".join(errors), row)
+            stats["invalid"] += 1
+            continue
+
+        candidates.append((line_no, row))
+
+    rows = [
+        [str(uuid.uuid4())] + [row[f] for f in CUSTOMER_HEADER[1:]]
+        for _, row in candidates
+    ]
+    if keys is None:
+        results = append_unique_rows(
+            CUSTOMER_FILE, rows, CUSTOMER_UNIQUE_FIELDS, fsync=True
+        )
+    else:
+        results = append_new_rows(keys, rows)
+
+    for (line_no, row), (_, duplicate) in zip(candidates, results):
+        if duplicate:
+            _reject(rejects_writer, line_no, f"Duplicate {duplicate}", row)
+            stats["duplicate"] += 1
+        else:
+            stats["imported"] += 1
+    stats["batches"] += any(offset is not None for offset, _ in results)
+
+
+def run(path, fmt, batch_size, rejects_path):
+    ensure_table(CUSTOMER_FILE, CUSTOMER_HEADER)
+
+    stats = {"read": 0, "imported": 0, "invalid": 0, "duplicate": 0, "batches": 0}
+    records = read_records(path, fmt)
+    start = time.perf_counter()
+    keys = open_key_set() if backend() == "csv" else None
+
+    try:
+        with open(rejects_path, "w", newline="", encoding="utf-8") as f:
+            rejects_writer = csv.writer(f)
+            rejects_writer.writerow(REJECT_HEADER)
+            while True:
+                chunk = list(islice(records, batch_size))
+                if not chunk:
+                    break
+                stats["read"] += len(chunk)
+                process_chunk(chunk, rejects_writer, stats, keys)
+    finally:
+        if keys is not None:
+            close_key_set(keys)
+
+    elapsed = time.perf_counter() - start
+    rate = stats["read"] / elapsed if elapsed else 0.0
+    print(
+        f"read={stats['read']} imported={stats['imported']} "
+        f"invalid={stats['invalid']} duplicate={stats['duplicate']} "
+        f"batches={stats['batches']} elapsed={elapsed:.2f}s "
+        f"throughput={rate:,.0f} rows/s"
+    )
+    print(f"rejects written to {rejects_path}")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("path", help="CSV (with header) or JSONL file")
+    parser.add_argument("--format", choices=["csv", "jsonl"],
+                        help="default: from the file extension")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--rejects", help="default: <input>.rejects.csv")
+    args = parser.parse_args()
+
+    fmt = args.format or ("jsonl" if args.path.endswith(".jsonl") else "csv")
+    rejects = args.rejects or os.path.splitext(args.path)[0] + ".rejects.csv"
+    run(args.path, fmt, args.batch_size, rejects)
+
+
+if __name__ == "__main__":
+    main()
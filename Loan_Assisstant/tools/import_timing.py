@@ -0,0 +1,55 @@
+"""
+Reports import cost of the app's entry modules.
+
+Each module is imported in a fresh interpreter (cold start, what the
+first session of a server process pays) and then re-imported in the
+same process (what a Streamlit rerun pays). Also shows whether the
+heavy optional dependencies were pulled in.
+
+Usage (from Loan_Assisstant/):
+    python -m tools.import_timing
+"""
+
+import subprocess
+import sys
+
+MODULES = [
+    "streamlit",
+    "core.vision_kyc",
+    "flows.officer_flow",
+    "flows.customer_flow",
+]
+HEAVY = ["groq", "PIL.Image"]
+
+_PROBE = """
+import importlib, sys, time
+t = time.perf_counter()
+importlib.import_module({module!r})
+cold = time.perf_counter() - t
+t = time.perf_counter()
+for _ in range(1000):
+    importlib.import_module({module!r})
+rerun = (time.perf_counter() - t) / 1000
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(f"{{cold * 1000:.1f}}|{{rerun * 1e6:.2f}}|{{','.join(heavy) or '-'}}")
+"""
+
+
+def probe(module):
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY)],
+        capture_output=True, text=True, check=True
+    ).stdout.strip()
+    cold, rerun, heavy = out.split("|")
+    return float(cold), float(rerun), heavy
+
+
+def main():
+    print(f"{'module':<22}{'cold (ms)':>12}{'rerun (us)':>12}  heavy deps loaded")
+    for module in MODULES:
+        cold, rerun, heavy = probe(module)
+        print(f"{module:<22}{cold:>12.1f}{rerun:>12.2f}  {heavy}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Batch KYC re-extraction over stored documents.
+
+Documents are looked up as <docs dir>/<Application_ID>.<png|jpg|jpeg>.
+By default only applications with missing extracted fields or a
+document failure reason are processed.
+
+- concurrency : --workers parallel vision calls
+- rate limit  : --rpm requests per minute across all workers
+- resumable   : finished ids are appended to --checkpoint after their
+                results are written; a rerun skips them
+- bulk writes : results go to data/kyc_results.csv every --batch-size
+                documents (one append + fsync per batch)
+- failures    : a failed extraction (e.g. the API is down) is reported
+                but neither recorded nor checkpointed, so it never
+                replaces an earlier result and a rerun retries it
+- summary     : documents, failures and throughput, plus the bytes
+                image normalization saved on the images actually sent
+
+Usage (from Loan_Assisstant/):
+    python -m tools.kyc_batch --docs data/documents --workers 8 --rpm 120
+
+Offline throughput run against the stub server:
+    python -m tools.stub_vision_server --port 8765 &
+    GROQ_BASE_URL=http://127.0.0.1:8765 python -m tools.kyc_batch ...
+"""
+
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from core.kyc_jobs import record_results, with_late_result
+from core.repository import APP_FILE, read_rows
+from core.status_log import apply_current_status
+from core.vision_kyc import extract_identity_from_image, normalization_stats
+
+DOC_EXTENSIONS = (".png", ".jpg", ".jpeg")
+EXTRACTED_FIELDS = ("Extracted_Name", "Extracted_DOB", "Extracted_ID_Last4")
+
+
+# =============================
+# RATE LIMIT
+# =============================
+class RateLimiter:
+    """
+    Spaces calls evenly so at most `rpm` start in any minute.
+    """
+
+    def __init__(self, rpm):
+        self.interval = 60.0 / rpm if rpm else 0.0
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        time.sleep(max(0.0, slot - now))
+
+
+# =============================
+# SELECTION
+# =============================
+def needs_extraction(app):
+    return (
+        any(not app.get(f) for f in EXTRACTED_FIELDS)
+        or bool(app.get("Document_Failure_Reason"))
+    )
+
+
+def find_document(docs_dir, application_id):
+    for ext in DOC_EXTENSIONS:
+        path = os.path.join(docs_dir, application_id + ext)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def select_jobs(docs_dir, checkpoint, include_all):
+    apps = apply_current_status([dict(r) for r in read_rows(APP_FILE)])
+    jobs = []
+    for app in apps:
+        app_id = app["Application_ID"]
+        if app_id in checkpoint:
+            continue
+        if not include_all and not needs_extraction(with_late_result(app)):
+            continue
+        path = find_document(docs_dir, app_id)
+        if path:
+            jobs.append((app_id, path))
+    return jobs
+
+
+# =============================
+# RUN
+# =============================
+def _extract(path, limiter, use_cache):
+    with open(path, "rb") as f:
+        file_bytes = f.read()
+    limiter.wait()
+    try:
+        return extract_identity_from_image(file_bytes, use_cache=use_cache)
+    except Exception as e:
+        return None, f"Extraction failed: {e}"
+
+
+def _flush(batch, checkpoint_path):
+    if not batch:
+        return
+    record_results(batch)
+    with open(checkpoint_path, "a", encoding="utf-8") as f:
+        f.writelines(app_id + "\n" for app_id, _, _ in batch)
+        f.flush()
+        os.fsync(f.fileno())
+    batch.clear()
+
+
+def run(docs_dir, workers, rpm, checkpoint_path, batch_size,
+        include_all=False, use_cache=True):
+    jobs = select_jobs(docs_dir, load_checkpoint(checkpoint_path), include_all)
+    print(f"{len(jobs)} document(s) to process")
+
+    limiter = RateLimiter(rpm)
+    batch = []
+    failed = []
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_extract, path, limiter, use_cache): app_id
+            for app_id, path in jobs
+        }
+        for future in as_completed(futures):
+            extracted, error = future.result()
+            if error:
+                failed.append((futures[future], error))
+                continue
+            batch.append((futures[future], extracted, error))
+            if len(batch) >= batch_size:
+                _flush(batch, checkpoint_path)
+
+    _flush(batch, checkpoint_path)
+
+    elapsed = time.perf_counter() - start
+    rate = len(jobs) / elapsed if elapsed else 0.0
+    print(
+        f"processed={len(jobs)} failed={len(failed)} "
+        f"elapsed={elapsed:.2f}s throughput={rate:.2f} docs/s"
+    )
+    images = normalization_stats()
+    if images["images"]:
+        print(
+            f"images sent={images['images']} "
+            f"bytes {images['original_bytes']:,} -> {images['sent_bytes']:,} "
+            f"(saved {images['saved_bytes']:,})"
+        )
+    for app_id, error in failed[:10]:
+        print(f"  {app_id}: {error}")
+    if failed:
+        print("failed documents were not recorded; rerun to retry them")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--docs", required=True, help="directory of documents")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rpm", type=float, default=60,
+                        help="requests per minute budget (0 = unlimited)")
+    parser.add_argument("--checkpoint", default="data/kyc_batch.checkpoint")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--all", action="store_true",
+                        help="re-extract every application with a document")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always call the vision model")
+    args = parser.parse_args()
+
+    run(
+        args.docs,
+        args.workers,
+        args.rpm,
+        args.checkpoint,
+        args.batch_size,
+        include_all=args.all,
+        use_cache=not args.no_cache
+    )
+
+
+if __name__ == "__main__":
+    main()
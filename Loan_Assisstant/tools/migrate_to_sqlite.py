@@ -0,0 +1,126 @@
+"""
+One-shot migration of the CSV store into SQLite.
+
+Every table CSV under data/ becomes a table of the same name and
+columns in --db (see core.sqlite_store); rerunning replaces the
+tables' contents. branch_visits.csv, written without a header row,
+gets the column names from core.repository.
+Notification cursors hold CSV byte offsets and are translated to the
+matching rowids. The pending queue is not copied: it is rebuilt from
+the applications table on first use. The audit log stays in its files
+(see core.audit_log).
+
+Usage (from Loan_Assisstant/):
+    python -m tools.migrate_to_sqlite
+then set STORAGE_BACKEND = "sqlite" in core/config.py.
+"""
+
+import argparse
+import glob
+import os
+import time
+from bisect import bisect_right
+
+from core import csv_index, sqlite_store
+from core.config import SQLITE_FILE
+from core.inbox import CURSOR_FILE
+from core.pending_queue import QUEUE_FILE
+from core.repository import (
+    APP_FILE,
+    AUDIT_FILE,
+    CUSTOMER_FILE,
+    CUSTOMER_UNIQUE_FIELDS,
+    MASTER_TABLES,
+    NOTIFY_FILE,
+    OFFICER_FILE,
+    replace_rows,
+    set_backend
+)
+from core.scoring import SCORE_FILE
+
+# Columns the flows look up by; indexed up front instead of on first use
+INDEXED_FIELDS = {
+    CUSTOMER_FILE: ("Customer_ID",) + CUSTOMER_UNIQUE_FIELDS,
+    OFFICER_FILE: ("EmpCode",),
+    APP_FILE: ("Application_ID", "Customer_ID"),
+    NOTIFY_FILE: ("Customer_ID",),
+    CURSOR_FILE: ("Customer_ID",),
+    SCORE_FILE: ("Application_ID",)
+}
+SKIPPED = (QUEUE_FILE, AUDIT_FILE)
+
+
+def read_csv(path):
+    """
+    Returns (header, [(offset, row)]) for a table CSV.
+    """
+    known = MASTER_TABLES.get(path)
+    with open(path, "rb") as f:
+        records = [(o, row) for o, _, row in csv_index.iter_records(f, 0)]
+    if not records:
+        return known or [], []
+    if known is None or records[0][1] == known:
+        header, records = records[0][1], records[1:]
+    else:
+        header = known
+    return header, [(o, row[:len(header)]) for o, row in records]
+
+
+def translate_cursors(header, rows, notify_offsets):
+    """
+    Cursor rows point at the byte offset of the last notification
+    seen; rowids are 1-based in file order.
+    """
+    col = header.index("Last_Seen_Offset")
+    result = []
+    for row in rows:
+        offset = int(row[col])
+        row = list(row)
+        row[col] = str(bisect_right(notify_offsets, offset))
+        result.append(row)
+    return result
+
+
+def migrate(db_path):
+    set_backend("sqlite", db_path)
+    notify_offsets = []
+    paths = sorted(
+        p.replace(os.sep, "/") for p in glob.glob("data/*.csv")
+    )
+    # notifications before cursors, which refer to them
+    paths.sort(key=lambda p: p == CURSOR_FILE)
+
+    for path in paths:
+        if path in SKIPPED:
+            continue
+        start = time.perf_counter()
+        header, records = read_csv(path)
+        if not header:
+            continue
+
+        rows = [row for _, row in records]
+        if path == NOTIFY_FILE:
+            notify_offsets = [o for o, _ in records]
+        if path == CURSOR_FILE:
+            rows = translate_cursors(header, rows, notify_offsets)
+
+        replace_rows(path, header, rows)
+        for field in INDEXED_FIELDS.get(path, ()):
+            sqlite_store.ensure_index(path, field)
+
+        print(
+            f"{path:40s} -> {sqlite_store.table_name(path):24s} "
+            f"{len(rows):>9,} rows  {time.perf_counter() - start:.2f}s"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate CSV store to SQLite")
+    parser.add_argument("--db", default=SQLITE_FILE)
+    args = parser.parse_args()
+    migrate(args.db)
+    print(f"done: {args.db}")
+
+
+if __name__ == "__main__":
+    main()
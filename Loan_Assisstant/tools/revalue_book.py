@@ -0,0 +1,100 @@
+"""
+Revalue the active loan book at a new gold rate and list LTV breaches.
+
+Usage (from Loan_Assisstant/):
+    python -m tools.revalue_book --rate 5400
+    python -m tools.revalue_book --rate 5390 --prev-rate 5400   # tick
+    python -m tools.revalue_book --rate 5400 --synthetic 5000000 # benchmark
+"""
+
+import argparse
+import csv
+import time
+
+from core.config import GOLD_RATE_PER_GRAM, PURITY_FACTOR
+from core.revaluation import (
+    build_book,
+    load_book,
+    revalue,
+    breaches_at,
+    breach_delta,
+    breach_report
+)
+
+REPORT_FIELDS = [
+    "Application_ID", "Requested_Amount", "Collateral_Value", "LTV",
+    "Breach_Rate"
+]
+
+
+def synthetic_book(count, seed=11):
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    carats = np.array(sorted(PURITY_FACTOR))
+    factors = np.array([PURITY_FACTOR[c] for c in carats])
+    pick = rng.integers(0, len(carats), count)
+
+    weight = np.round(rng.uniform(5, 500, count), 1)
+    carat, purity = carats[pick], factors[pick]
+    requested = np.floor(
+        weight * GOLD_RATE_PER_GRAM * purity * rng.uniform(0.3, 0.75, count)
+    )
+    ids = np.array([f"GL-{i:08X}" for i in range(count)], dtype=object)
+    return build_book(ids, weight, carat, requested)
+
+
+def write_report(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gold-rate revaluation")
+    parser.add_argument("--rate", type=float, required=True,
+                        help="new gold rate per gram")
+    parser.add_argument("--prev-rate", type=float,
+                        help="previous rate; report only loans that changed")
+    parser.add_argument("--synthetic", type=int,
+                        help="use N synthetic loans instead of the CSV book")
+    parser.add_argument("--out", default="data/ltv_breaches.csv")
+    args = parser.parse_args()
+
+    t = time.perf_counter()
+    book = synthetic_book(args.synthetic) if args.synthetic else load_book()
+    load_s = time.perf_counter() - t
+    print(f"loaded {len(book['ids']):,} active loans in {load_s:.2f}s")
+
+    t = time.perf_counter()
+    full = revalue(book, args.rate)
+    full_s = time.perf_counter() - t
+    print(
+        f"full pass  : {int(full['breached'].sum()):,} breaches "
+        f"in {full_s * 1000:.1f} ms"
+    )
+
+    t = time.perf_counter()
+    if args.prev_rate is not None:
+        breached, cured = breach_delta(book, args.prev_rate, args.rate)
+        print(
+            f"tick {args.prev_rate} -> {args.rate}: "
+            f"{len(breached):,} newly breached, {len(cured):,} cured "
+            f"in {(time.perf_counter() - t) * 1000:.2f} ms"
+        )
+        indices = breached
+    else:
+        indices = breaches_at(book, args.rate)
+        print(
+            f"indexed    : {len(indices):,} breaches "
+            f"in {(time.perf_counter() - t) * 1000:.2f} ms"
+        )
+
+    if not args.synthetic:
+        write_report(args.out, breach_report(book, indices, args.rate))
+        print(f"report written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
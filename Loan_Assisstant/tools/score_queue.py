@@ -0,0 +1,33 @@
+"""
+Batch scoring over the pending queue.
+
+Scores every pending application without a stored score (or all of
+them with --rescore) so the officer dashboard never computes one.
+
+Usage (from Loan_Assisstant/):
+    python -m tools.score_queue
+"""
+
+import argparse
+
+from core.kyc_jobs import with_late_result
+from core.pending_queue import pending_applications
+from core.scoring import score_and_save, score_pending
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score pending applications")
+    parser.add_argument("--rescore", action="store_true",
+                        help="recompute scores that already exist")
+    args = parser.parse_args()
+
+    apps = [with_late_result(a) for a in pending_applications()]
+    if args.rescore:
+        scored = sum(score_and_save(a) is not None for a in apps)
+    else:
+        scored = score_pending(apps)
+    print(f"{len(apps)} pending, {scored} scored")
+
+
+if __name__ == "__main__":
+    main()
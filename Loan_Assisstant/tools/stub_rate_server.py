@@ -0,0 +1,54 @@
+"""
+Local stand-in for a gold-rate feed (GOLD_RATE_SOURCE = "http").
+
+Serves {"rate_per_gram": ..., "as_of": ...} on any GET, drifting the
+rate by up to --drift rupees per request:
+
+    python -m tools.stub_rate_server --port 8766 --rate 6000 --drift 5
+"""
+
+import argparse
+import json
+import random
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class RateHandler(BaseHTTPRequestHandler):
+    rate = 6000.0
+    drift = 0.0
+
+    def do_GET(self):
+        RateHandler.rate += random.uniform(-self.drift, self.drift)
+        body = json.dumps({
+            "rate_per_gram": round(RateHandler.rate, 2),
+            "as_of": datetime.now().isoformat()
+        }).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub gold-rate server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--rate", type=float, default=6000.0)
+    parser.add_argument("--drift", type=float, default=0.0)
+    args = parser.parse_args()
+
+    RateHandler.rate = args.rate
+    RateHandler.drift = args.drift
+    server = ThreadingHTTPServer((args.host, args.port), RateHandler)
+    print(f"Stub gold-rate server on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
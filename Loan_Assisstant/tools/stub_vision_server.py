@@ -0,0 +1,76 @@
+"""
+Local stand-in for the Groq chat-completions endpoint.
+
+Answers every vision request with a fixed KYC reply after --latency
+seconds, so tools/kyc_batch.py can be benchmarked offline:
+
+    python -m tools.stub_vision_server --port 8765 --latency 0.5
+    GROQ_BASE_URL=http://127.0.0.1:8765 python -m tools.kyc_batch --docs ...
+"""
+
+import argparse
+import json
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STUB_REPLY = (
+    "Name: Stub Customer\n"
+    "DOB_or_Age: 01-01-1990\n"
+    "Aadhaar_Number: 1234 5678 9012\n"
+    "PAN_Number: ABCDE1234F\n"
+    "Confidence_Level: High"
+)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        time.sleep(self.latency)
+
+        body = json.dumps({
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": STUB_REPLY},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "total_tokens": 0
+            }
+        }).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub vision server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.5,
+                        help="seconds to wait before answering")
+    args = parser.parse_args()
+
+    StubHandler.latency = args.latency
+    server = ThreadingHTTPServer((args.host, args.port), StubHandler)
+    print(f"Stub vision server on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()